@@ -4,32 +4,75 @@ Tests the detection of the number cards from a live camera feed
 
 # run with repo root as working dir
 from src.dataprocessing.processing.detect_cards import detect_card_contours, draw_card_contours, choose_card_contours
-from misc.use_camera import start_camera, stop_camera, get_frame
+from misc.use_camera import ThreadedCamera
+import time
+import numpy as np
 import cv2
 
+grey = None  # greyscale output buffer, allocated once and reused every frame
+edge_buf = None  # edge-map buffer for detect_card_contours, also allocated once
+det_bounds = None  # (width_range, height_range) - resolution only, so computed once
+thresholds = (100, 200)  # canny thresholds, constant
+scale = 0.5  # detection runs on a downscaled frame - 1/4 of the pixels to convert and scan
+
+# with a usable OpenCL device the per-pixel stages (resize + cvtColor) run on the GPU
+# via the T-API and only the small greyscale image comes back to the host
+use_umat = cv2.ocl.haveOpenCL()
+
+
+def process(frame):
+    """Worker-stage function - greyscale + card detection, returns the annotated image"""
+    global grey, edge_buf, det_bounds
+
+    # downscale first so cvtColor and the detection only touch the small image
+    if use_umat:
+        usmall = cv2.resize(cv2.UMat(frame), None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        grey = cv2.cvtColor(usmall, cv2.COLOR_BGR2GRAY).get()
+    else:
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        if grey is None:
+            grey = np.empty(small.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=grey)
+
+    # the resolution never changes mid-stream, so the bounds and buffers are built once
+    if det_bounds is None:
+        h, w = grey.shape
+        det_bounds = ((0, w), (0, h))
+        edge_buf = np.empty((h, w), dtype=np.uint8)
+    width_range, height_range = det_bounds
+
+    result = detect_card_contours(grey, width_range, height_range, thresholds, edges=edge_buf)
+    result = choose_card_contours(result)
+    result_img = frame
+    if result != []:
+        for vals in result:
+            # map the boxes back to full-resolution coordinates before drawing
+            x, y, w, h = [int(v / scale) for v in vals]
+            result_img = draw_card_contours(frame, (x, y, w, h))
+
+    return result_img
+
 
 # default, change it to the video feed from mobile if that is something you find interesting
 # note when using a http feed, the feed should be in the form of http://<ip>:<port>/video
 inp = input("Enter the camera feed url (0 = default laptop one): ")
 if inp == "0":
     inp = 0
-cap = start_camera(inp)
+camera = ThreadedCamera(inp, process, adaptive_skip=True).start()
 
-while True:
-    frame = get_frame(cap)
-    shape = frame.shape
+# imshow can stall on the GUI blit, so cap how often it runs - detection keeps its own pace
+last_show = 0.0
+show_period = 1 / 30.0
 
-    grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    result = detect_card_contours(grey, (0, shape[1]), (0, shape[0]), (100, 200))
-    result = choose_card_contours(result)
-    result_img = grey
-    if result != []:
-        for vals in result:
-            x, y, w, h = vals
-            result_img = draw_card_contours(grey, (x, y, w, h))
+while True:
+    frame, result_img = camera.read()
 
-    cv2.imshow("frame", result_img)
+    now = time.perf_counter()
+    if now - last_show >= show_period:
+        cv2.imshow("frame", result_img)
+        last_show = now
 
     if cv2.waitKey(1) == ord("q"):
-        stop_camera(cap)
+        camera.stop()
         break
@@ -2,11 +2,25 @@
 Tests the detection of the Fiducial tags from a live camera feed
 """
 
-from src.dataprocessing.detect_tag import detect_aruco  # run with repo root as working dir
-from misc.use_camera import start_camera, stop_camera, get_frame
+from src.dataprocessing.processing.detect_tag import detect_aruco  # run with repo root as working dir
+from misc.use_camera import ThreadedCamera
+import time
+import logging
+import logging.handlers
+import queue
 import numpy as np
 import cv2
 
+# logging goes through a queue so the stdout flush happens on a background thread
+# and never stalls the frame loop - %s formatting is also lazy, so filtered-out
+# messages cost nothing
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+
 # sample from a laptop webcam
 the_coefficients = {
     "camera_mat": [455.01779335911533, 449.638776236421, 347.7758170279836, 183.2528682832296],
@@ -16,55 +30,90 @@ the_coefficients = {
 }
 side_len = 5  # sample provided by the guys at sdc (cm)
 
+grey = None  # greyscale output buffer, allocated once and reused every frame
+scale = 0.5  # detection runs on a downscaled frame - 1/4 of the pixels to convert and scan
+
+# the intrinsics scale with the image, so pose estimates stay correct at the smaller size
+scaled_coefficients = {
+    "camera_mat": [v * scale for v in the_coefficients["camera_mat"]],
+    "distortion_mat": the_coefficients["distortion_mat"]
+}
+
+# built once - the dictionary table, the detector parameters and the drawing matrices
+# are all constants, no point rebuilding them every frame
+tag_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_5X5_1000)
+tag_parameters = cv2.aruco.DetectorParameters()
+detector = cv2.aruco.ArucoDetector(tag_dict, tag_parameters)
+
+fx, fy, cx, cy = tuple(the_coefficients["camera_mat"])
+true_cam_mat = np.array([
+    [fx, 0, cx],
+    [0, fy, cy],
+    [0, 0, 1],
+], dtype=np.float64)
+true_dist_coeff = np.asarray(the_coefficients["distortion_mat"], dtype=np.float64).reshape(1, -1)
+
+
+def process(frame):
+    """Worker-stage function - greyscale + ArUco detection, returns the pose output dict"""
+    global grey
+
+    # downscale first so cvtColor and the detection only touch the small image
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if grey is None:
+        grey = np.empty(small.shape[:2], dtype=np.uint8)
+    cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=grey)
+
+    return detect_aruco(grey, tag_dict, tag_parameters, scaled_coefficients, side_len, detector=detector)
+
+
 # default, change it to the video feed from mobile if that is something you find interesting
 # note when using a http feed, the feed should be in the form of http://<ip>:<port>/video
 inp = input("Enter the camera feed url (0 = default laptop one): ")
 if inp == "0":
     inp = 0
-cap = start_camera(inp)
+camera = ThreadedCamera(inp, process, adaptive_skip=True).start()
+
+# bind the hot calls to locals and precompute loop invariants - the per-frame cost here
+# is pure python overhead (attribute lookups, re-built constants), not the cv2 kernels
+draw_markers = cv2.aruco.drawDetectedMarkers
+draw_axes = cv2.drawFrameAxes
+axis_len = side_len * 0.5
+inv_scale = 1 / scale
+
+# imshow can stall on the GUI blit, so cap how often it runs - detection keeps its own pace
+last_show = 0.0
+show_period = 1 / 30.0
 
 counter = 0
 while True:
-    frame = get_frame(cap)
-
-    grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    tag_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_5X5_1000)
-    tag_parameters = cv2.aruco.DetectorParameters()
+    frame, output = camera.read()
 
-    output = detect_aruco(grey, tag_dict, tag_parameters, the_coefficients, side_len)
     if output == {}:
-        print("None Detected")
+        logger.debug("None Detected")
     else:
         rvecs = output["Rotational"]
         tvecs = output["Translation"]
-        corners = output["Corners"]
+        # corners come from the downscaled image - map back to full resolution for drawing
+        corners = tuple(c * inv_scale for c in output["Corners"])
         ids = output["IDs"]
 
-        fx, fy, cx, cy = tuple(the_coefficients["camera_mat"])
-        true_cam_mat = np.array([
-            [fx, 0, cx],
-            [0, fy, cy],
-            [0, 0, 1],
-        ])
-
-        true_dist_coeff = np.array([the_coefficients["distortion_mat"]])
-
+        # drawDetectedMarkers draws every marker in one call - only the axes are per marker
+        draw_markers(frame, corners, ids)
         for rvec, tvec in zip(rvecs, tvecs):
-            cv2.aruco.drawDetectedMarkers(frame, corners, ids)
-            cv2.drawFrameAxes(
-                frame, true_cam_mat, true_dist_coeff, rvec, tvec, side_len * 0.5
-            )
+            draw_axes(frame, true_cam_mat, true_dist_coeff, rvec, tvec, axis_len)
 
         if counter % 100 == 0:
-            print("Translational (cm) = {}".format(tvecs))
-            print("Rotational (degrees) = {}".format(rvec))
+            logger.debug("Translational (cm) = %s", tvecs)
+            logger.debug("Rotational (degrees) = %s", rvec)
 
         counter += 1
 
-    cv2.imshow("Camera Feed", frame)
+    now = time.perf_counter()
+    if now - last_show >= show_period:
+        cv2.imshow("Camera Feed", frame)
+        last_show = now
+
     if cv2.waitKey(1) == ord("q"):
-        stop_camera(cap)
+        camera.stop()
         break
-
-cap.release()
-cv2.destroyAllWindows()
@@ -2,17 +2,25 @@
 Just to simplify the use of the camera
 """
 
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import queue
+import threading
+import time
 import cv2
 import numpy as np
-from typing import Union
+from typing import Any, Callable, Optional, Tuple, Union
 
 
-def start_camera(source: Union[str, int]) -> cv2.VideoCapture:
+def start_camera(source: Union[str, int], native_grey: bool = False) -> cv2.VideoCapture:
     """
     Starts the camera feed
 
     Parameters:
       - source (Union[str, int]): the source of the camera feed, can be a URL or an integer for a connected camera
+      - native_grey (=False): request raw YUYV frames from the driver instead of decoded BGR - the Y plane
+        already is the greyscale image, so consumers that only need greyscale (use get_grey_frame) skip
+        the BGR decode and the BGR2GRAY pass entirely
 
     Returns:
       - cap (cv2.VideoCapture): the camera feed object
@@ -27,6 +35,13 @@ def start_camera(source: Union[str, int]) -> cv2.VideoCapture:
     if not cap.isOpened():
         raise RuntimeError("Camera Unavailable")
 
+    # keep the driver-side queue as small as possible so frames cannot go stale there
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    if native_grey:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"YUYV"))
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
     return cap
 
 
@@ -59,3 +74,237 @@ def get_frame(cap: cv2.VideoCapture) -> np.ndarray:
         raise RuntimeError("Error with camera feed")
 
     return frame
+
+
+def get_grey_frame(cap: cv2.VideoCapture) -> np.ndarray:
+    """
+    Gets a greyscale frame from the camera feed
+
+    For a camera started with native_grey=True this is just the Y plane of the raw
+    YUYV frame - no colour conversion runs at all. For a normal BGR feed it falls
+    back to cv2.cvtColor
+
+    Parameters:
+        - cap (cv2.VideoCapture): the camera feed object
+
+    Returns:
+        - grey (np.ndarray): the greyscale frame
+    """
+
+    frame = get_frame(cap)
+
+    if frame.ndim == 2:
+        # some V4L2 builds hand packed YUYV back as a 2-D (h, 2*w) byte array - every
+        # other column is luma, the rest is interleaved chroma
+        if frame.shape[1] == 2 * int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)):
+            return np.ascontiguousarray(frame[:, ::2])
+        return frame
+    elif frame.shape[2] == 2:  # packed YUYV - every other byte is luma
+        return np.ascontiguousarray(frame[:, :, 0])
+
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+class ThreadedCamera:
+    """
+    Runs the camera loop as a three-stage threaded pipeline so grabbing, processing and
+    displaying overlap instead of running one after the other
+
+    Stages:
+        - a reader thread grabs from the driver and feeds frames into a bounded queue
+        - a worker thread runs the supplied process function (greyscale + detection)
+        - the caller (main thread) pops (frame, result) pairs with read() for imshow/waitKey
+
+    The input queue holds a single frame and the reader only decodes when the worker
+    has a free slot (drop-latest discipline), so when the worker runs slower than the
+    camera FPS it always picks up the freshest frame instead of working through a
+    backlog - end-to-end latency stays at ~1 frame. The output queue is bounded
+    (maxsize=2) so the worker cannot flood memory either (back-pressure)
+    """
+
+    def __init__(self, source: Union[str, int], process: Optional[Callable[[np.ndarray], Any]] = None,
+                 adaptive_skip: bool = False):
+        """
+        Parameters:
+            - source (Union[str, int]): the source of the camera feed, same as start_camera
+            - process (Optional[Callable]): function run on each frame in the worker thread,
+              its return value is handed back alongside the frame by read()
+            - adaptive_skip (=False): when the process function takes longer than a frame
+              period, sit out that many frames (reusing the previous result) so the display
+              keeps flowing at camera rate instead of stalling behind the detection
+        """
+
+        self.cap = start_camera(source)
+        self.process = process
+        self.adaptive_skip = adaptive_skip
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self._fps = fps if fps and fps > 0 else 30.0
+        # one shared stop signal - every stage polls it, so shutdown is race-free
+        self.stop_event = threading.Event()
+        self.q_in = queue.Queue(maxsize=1)
+        self.q_out = queue.Queue(maxsize=2)
+        self._reader_thread = threading.Thread(target=self._reader, daemon=True)
+        self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+
+    def start(self) -> "ThreadedCamera":
+        """
+        Starts the reader and worker threads
+
+        Returns:
+            - self, so the call can be chained as ThreadedCamera(...).start()
+        """
+
+        self.stop_event.clear()
+        self._reader_thread.start()
+        self._worker_thread.start()
+        return self
+
+    def _reader(self) -> None:
+        """Reader stage - grabs at full speed, decodes only frames the worker will see"""
+
+        while not self.stop_event.is_set():
+            # grab() just advances the driver queue (cheap, no decode) - while the worker
+            # is still busy, stale frames are dropped here without ever paying for the
+            # decode, which for MJPG cameras is the expensive part of read()
+            if not self.cap.grab():
+                continue
+            if self.q_in.full():
+                continue
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            self.q_in.put(frame)
+
+    def _worker(self) -> None:
+        """Worker stage - pops raw frames and runs the process function on them"""
+
+        skip = 0
+        frame_idx = 0
+        result = None
+        while not self.stop_event.is_set():
+            try:
+                frame = self.q_in.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if frame_idx % (skip + 1) == 0:
+                t0 = time.perf_counter()
+                result = self.process(frame) if self.process is not None else None
+                if self.adaptive_skip:
+                    # however many frame periods the detection ate, skip that many frames
+                    skip = int((time.perf_counter() - t0) * self._fps)
+            frame_idx += 1
+            self.q_out.put((frame, result), block=True)
+
+    def read(self) -> Tuple[np.ndarray, Any]:
+        """
+        Gets the next processed frame from the pipeline (blocks until one is ready)
+
+        Returns:
+            - (frame, result): the raw frame and whatever the process function returned
+        """
+
+        return self.q_out.get()
+
+    def stop(self) -> None:
+        """Signals the threads to stop, waits for them and releases the camera"""
+
+        self.stop_event.set()
+        self._reader_thread.join(timeout=1)
+        self._worker_thread.join(timeout=1)
+        stop_camera(self.cap)
+
+
+def _capture_worker(source, shape, shm_names, ready_events, stop_event) -> None:
+    """Child-process body for MultiProcessCamera - capture loop writing into shared memory"""
+
+    cap = start_camera(source)
+    shms = [shared_memory.SharedMemory(name=n) for n in shm_names]
+    slots = [np.ndarray(shape, dtype=np.uint8, buffer=s.buf) for s in shms]
+
+    i = 0
+    while not stop_event.is_set():
+        if ready_events[i].is_set():  # parent has not consumed this slot yet
+            time.sleep(0.001)
+            continue
+        try:
+            frame = get_frame(cap)
+        except RuntimeError:
+            continue
+        if frame.shape != shape:
+            frame = cv2.resize(frame, (shape[1], shape[0]))
+        slots[i][...] = frame
+        ready_events[i].set()
+        i ^= 1
+
+    cap.release()
+    for shm in shms:
+        shm.close()
+
+
+class MultiProcessCamera:
+    """
+    Runs the capture loop in its own process, for setups with more than one feed - each
+    camera then has its own interpreter (and GIL), so two feeds cannot stall each other
+
+    Frames cross the process boundary through two shared-memory slots used as a double
+    buffer: the child fills one slot while the parent reads the other, with an Event per
+    slot as the handshake. The parent maps the slots as ndarrays, so no pickling or
+    copying happens on the way over
+    """
+
+    def __init__(self, source: Union[str, int], width: int = 640, height: int = 480):
+        """
+        Parameters:
+            - source (Union[str, int]): the source of the camera feed, same as start_camera
+            - width/height (=640/480): frame size of the shared slots - frames from the
+              camera are resized to this if they differ (the size must be known up front
+              to allocate the shared memory)
+        """
+
+        self.shape = (height, width, 3)
+        nbytes = height * width * 3
+        self._shms = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(2)]
+        self._views = [np.ndarray(self.shape, dtype=np.uint8, buffer=s.buf) for s in self._shms]
+        self._ready = [mp.Event(), mp.Event()]
+        self._next = 0
+        self.stop_event = mp.Event()
+        self._proc = mp.Process(
+            target=_capture_worker,
+            args=(source, self.shape, [s.name for s in self._shms], self._ready, self.stop_event),
+            daemon=True
+        )
+
+    def start(self) -> "MultiProcessCamera":
+        """
+        Starts the capture process
+
+        Returns:
+            - self, so the call can be chained as MultiProcessCamera(...).start()
+        """
+
+        self._proc.start()
+        return self
+
+    def read(self) -> np.ndarray:
+        """
+        Gets the next frame from the capture process (blocks until one is ready)
+
+        Returns:
+            - frame (np.ndarray): a copy of the shared slot, safe to hold onto
+        """
+
+        i = self._next
+        self._ready[i].wait()
+        frame = np.array(self._views[i])  # copy out so the child can refill the slot
+        self._ready[i].clear()
+        self._next = i ^ 1
+        return frame
+
+    def stop(self) -> None:
+        """Signals the capture process to stop, waits for it and frees the shared memory"""
+
+        self.stop_event.set()
+        self._proc.join(timeout=1)
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
@@ -3,15 +3,48 @@ Unified AOCS Control System for CubeSat
 Combines health check, positioning, and ArUco docking functionality
 """
 
+import math
 import time
+from collections import deque
 import smbus
 import RPi.GPIO as GPIO
 import numpy as np
 import json
 import threading
 import socket
+import selectors
 import struct
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - the stdlib parser is the fallback
+    orjson = None
+
+try:
+    import pigpio
+except ImportError:  # pigpio is optional - software PWM via RPi.GPIO is the fallback
+    pigpio = None
+
+try:
+    from smbus2 import SMBus as SMBus2, i2c_msg
+except ImportError:  # smbus2 is optional - plain smbus block reads are the fallback
+    SMBus2 = None
+    i2c_msg = None
+
+try:
+    from AOCS._pid_kernels import pid_step, detumble_step
+except ImportError:  # standalone run from src/AOCS
+    from _pid_kernels import pid_step, detumble_step
+
+# vision message layout - compiled once so the format string is not re-parsed per message
+_VISION_MSG = struct.Struct('<ffB')  # angle_error, distance, detected
+_ACK = struct.Struct('<B').pack(1)
+
+# gyro sample layout - three big-endian int16s. A compiled Struct beats
+# np.frombuffer here: NumPy's per-call overhead dwarfs the decode for only
+# three values (frombuffer would only win on batched FIFO reads)
+_GYRO_SAMPLE = struct.Struct('>hhh')
+
 
 class AOCSController:
     def __init__(self, constants=None, logger=None):
@@ -69,6 +102,12 @@ class AOCSController:
         self.ENA = self.constants["PINS"]["ENA"]
         self.MPU9250_ADDR = self.constants["Address"]["MPU9250_ADDR"]
         self.I2C_BUS = self.constants["Address"]["I2C_BUS"]
+        self._dir_pins = [self.IN1, self.IN2]
+
+        # Last values written to the hardware - lets the setters skip the GPIO/PWM
+        # calls entirely when the controller asks for what is already set
+        self._last_dir = None
+        self._last_speed = -1
         
         # State variables
         self.current_angle = 0.0
@@ -87,14 +126,35 @@ class AOCSController:
         self.error_sum = 0
         self.last_error = 0
         
-        # Filter parameters
+        # Filter parameters ((1 - alpha) computed once - it is a constant the filter
+        # would otherwise rebuild every tick)
         self.alpha = self.constants["CONTROL"]["filter_alpha"]
+        self._one_minus_alpha = 1.0 - self.alpha
         self.filtered_gyro = 0.0
+
+        # Cache the CONTROL entries the loops read every tick - an attribute load is
+        # cheaper than two dict lookups at 50-100 Hz
+        control = self.constants["CONTROL"]
+        self.docking_tolerance = control["docking_tolerance"]
+        self.docking_max_speed = control["docking_max_speed"]
+        self.position_tolerance = control["position_tolerance"]
+        self.detumbling_deadzone = control["detumbling_deadzone"]
         
-        # Vision communication
+        # smbus is not thread-safe - the vision thread and the control loop must not
+        # interleave transactions or reads come back corrupt
+        self._i2c_lock = threading.Lock()
+
+        # Vision communication - the latest message lives as one immutable record in a
+        # single-slot deque (append and [-1] are atomic under the GIL), so the control
+        # loop always sees a coherent sample - angle_error, distance and detected can
+        # never be read half-updated. Dict access for status reporting goes through
+        # the vision_data property
         self.communication_port = 8888
-        self.vision_data = {"angle_error": 0.0, "distance": 0.0, "detected": False}
-        self.last_vision_update = 0
+        self._vision_q = deque([(0.0, 0.0, False, 0)], maxlen=1)  # angle_error, distance, detected, monotonic ns
+        self.last_vision_update_ns = 0
+        # waiters (docking) sleep on this instead of polling - they wake the moment
+        # a new sample arrives rather than up to 100 ms later
+        self._vision_cv = threading.Condition()
         
         # Initialise hardware
         self.setup_gpio()
@@ -120,8 +180,20 @@ class AOCSController:
             GPIO.setup(self.IN1, GPIO.OUT)
             GPIO.setup(self.IN2, GPIO.OUT)
 
-            self.pwm = GPIO.PWM(self.ENA, 1000)
-            self.pwm.start(0)
+            # prefer the BCM PWM peripheral via pigpio - a duty-cycle update is then
+            # one register write with no background toggling thread and none of the
+            # ~100 us edge jitter of RPi.GPIO's software PWM
+            self._pi = None
+            if pigpio is not None:
+                pi = pigpio.pi()
+                if pi.connected:
+                    self._pi = pi
+                    self._pi.hardware_PWM(self.ENA, 1000, 0)
+                    self.logger('INFO', 'Using pigpio hardware PWM')
+
+            if self._pi is None:
+                self.pwm = GPIO.PWM(self.ENA, 1000)
+                self.pwm.start(0)
 
             # Ensure motor is stopped
             self.stop_motor()
@@ -134,7 +206,18 @@ class AOCSController:
     def setup_i2c(self):
         """Setup I2C communication"""
         try:
-            self.bus = smbus.SMBus(self.I2C_BUS)
+            with self._i2c_lock:
+                # smbus2's i2c_rdwr hands preallocated message buffers straight to
+                # the kernel - no Python list of ints built per gyro sample
+                self._gyro_msgs = None
+                if SMBus2 is not None:
+                    self.bus = SMBus2(self.I2C_BUS)
+                    self._gyro_msgs = (
+                        i2c_msg.write(self.MPU9250_ADDR, [self.constants["Gyro"]["GYRO_XOUT_H"]]),
+                        i2c_msg.read(self.MPU9250_ADDR, 6)
+                    )
+                else:
+                    self.bus = smbus.SMBus(self.I2C_BUS)
             self.logger('INFO', 'I2C setup successful')
             return True
         except Exception as e:
@@ -144,8 +227,9 @@ class AOCSController:
     def initialise_mpu9250(self):
         """Initialise the MPU9250 IMU"""
         try:
-            self.bus.write_byte_data(self.MPU9250_ADDR, self.constants["Gyro"]["PWR_MGMT_1"], 0x00)
-            self.bus.write_byte_data(self.MPU9250_ADDR, self.constants["Gyro"]["GYRO_CONFIG"], 0x00)
+            with self._i2c_lock:
+                self.bus.write_byte_data(self.MPU9250_ADDR, self.constants["Gyro"]["PWR_MGMT_1"], 0x00)
+                self.bus.write_byte_data(self.MPU9250_ADDR, self.constants["Gyro"]["GYRO_CONFIG"], 0x00)
             time.sleep(0.1)
             self.logger('INFO', 'MPU9250 IMU initialised successfully')
             return True
@@ -154,43 +238,59 @@ class AOCSController:
             return False
 
     def read_gyro_data(self):
-        """Read gyroscope data"""
+        """Read gyroscope data - returns (x, y, z) in deg/s with z bias-corrected"""
         try:
-            data = self.bus.read_i2c_block_data(self.MPU9250_ADDR, self.constants["Gyro"]["GYRO_XOUT_H"], 6)
-
-            gyro_x = (data[0] << 8) | data[1]
-            gyro_y = (data[2] << 8) | data[3]
-            gyro_z = (data[4] << 8) | data[5]
-
-            if gyro_x > 32767: gyro_x -= 65536
-            if gyro_y > 32767: gyro_y -= 65536
-            if gyro_z > 32767: gyro_z -= 65536
+            with self._i2c_lock:
+                if self._gyro_msgs is not None:
+                    write_msg, read_msg = self._gyro_msgs
+                    self.bus.i2c_rdwr(write_msg, read_msg)
+                    raw = bytes(read_msg)
+                else:
+                    raw = bytes(self.bus.read_i2c_block_data(
+                        self.MPU9250_ADDR, self.constants["Gyro"]["GYRO_XOUT_H"], 6))
 
-            gyro_x = gyro_x / 131.0
-            gyro_y = gyro_y / 131.0
-            gyro_z = gyro_z / 131.0 - self.gyro_bias
+            # one C-level unpack yields the three signed int16s directly - no Python
+            # shifts, ORs or sign-extension branches per sample
+            gyro_x, gyro_y, gyro_z = _GYRO_SAMPLE.unpack(raw)
 
-            return {'x': gyro_x, 'y': gyro_y, 'z': gyro_z}
+            return (gyro_x / 131.0, gyro_y / 131.0, gyro_z / 131.0 - self.gyro_bias)
         except Exception as e:
             self.logger('ERROR', f'Error reading gyroscope: {e}')
-            return {'x': 0, 'y': 0, 'z': 0}
+            return (0.0, 0.0, 0.0)
 
     def set_motor_direction(self, direction):
         """Set motor direction: 1=forward, -1=reverse, 0=stop"""
+        # once the controller settles, direction stays the same tick after tick -
+        # don't re-write pins that already hold the right levels
         if direction > 0:
-            GPIO.output(self.IN1, GPIO.HIGH)
-            GPIO.output(self.IN2, GPIO.LOW)
+            direction = 1
+            levels = (GPIO.HIGH, GPIO.LOW)
         elif direction < 0:
-            GPIO.output(self.IN1, GPIO.LOW)
-            GPIO.output(self.IN2, GPIO.HIGH)
+            direction = -1
+            levels = (GPIO.LOW, GPIO.HIGH)
         else:
-            GPIO.output(self.IN1, GPIO.LOW)
-            GPIO.output(self.IN2, GPIO.LOW)
+            levels = (GPIO.LOW, GPIO.LOW)
+
+        if direction == self._last_dir:
+            return
+        self._last_dir = direction
+
+        # list form writes both pins in one GPIO.output call - one Python-to-C
+        # transition per direction change instead of two
+        GPIO.output(self._dir_pins, levels)
 
     def set_motor_speed(self, speed):
         """Set motor speed (0-100%)"""
-        speed = max(0, min(100, abs(speed)))
-        self.pwm.ChangeDutyCycle(speed)
+        # rounded to whole percent so sub-1% PID jitter doesn't trigger a PWM
+        # update every tick
+        speed = int(round(max(0, min(100, abs(speed)))))
+        if speed == self._last_speed:
+            return
+        self._last_speed = speed
+        if self._pi is not None:
+            self._pi.hardware_PWM(self.ENA, 1000, speed * 10_000)  # duty in millionths
+        else:
+            self.pwm.ChangeDutyCycle(speed)
 
     def stop_motor(self):
         """Stop the motor"""
@@ -199,23 +299,27 @@ class AOCSController:
 
     def normalise_angle(self, angle):
         """Normalise angle to [-180, 180] range"""
-        while angle > 180:
-            angle -= 360
-        while angle < -180:
-            angle += 360
-        return angle
+        # branchless - constant cost however many revolutions have accumulated,
+        # unlike the old while-loop version
+        return angle - 360.0 * math.floor((angle + 180.0) / 360.0)
 
     def update_current_angle(self, dt):
         """Update current angle based on gyroscope integration"""
-        gyro_data = self.read_gyro_data()
-        gyro_z = gyro_data['z']
+        gyro_z = self.read_gyro_data()[2]
+
+        # Apply complementary filter - one-pole form, a single subtract and
+        # multiply-add instead of two multiplies and a fresh (1 - alpha)
+        self.filtered_gyro += self._one_minus_alpha * (gyro_z - self.filtered_gyro)
 
-        # Apply complementary filter
-        self.filtered_gyro = self.alpha * self.filtered_gyro + (1 - self.alpha) * gyro_z
+        # Slow bias observer - with the motor stopped and the rate near zero the
+        # residual reading is almost pure bias, so trickle it into gyro_bias as it
+        # drifts with temperature instead of paying a full recalibration later
+        if not self.is_moving and abs(gyro_z) < 0.5:
+            self.gyro_bias += 1e-4 * gyro_z
 
-        # Integrate to get angle
-        self.current_angle += self.filtered_gyro * dt
-        self.current_angle = self.normalise_angle(self.current_angle)
+        # Integrate to get angle (normalise inlined - this runs every control tick)
+        angle = self.current_angle + self.filtered_gyro * dt
+        self.current_angle = angle - 360.0 * math.floor((angle + 180.0) / 360.0)
 
         return self.filtered_gyro
 
@@ -226,20 +330,22 @@ class AOCSController:
         self.logger('INFO', f'Calibrating gyroscope with {samples} samples...')
         self.logger('INFO', 'Please keep the CubeSat stationary during calibration...')
 
-        gyro_sum = 0.0
+        # preallocated buffer + one NumPy reduction at the end, instead of
+        # Python-scalar accumulation per sample
+        buf = np.empty(samples, dtype=np.float32)
         valid_samples = 0
 
         for i in range(samples):
             gyro_data = self.read_gyro_data()
             if gyro_data is not None:
-                gyro_sum += gyro_data['z']
+                buf[valid_samples] = gyro_data[2]
                 valid_samples += 1
                 if (i + 1) % 20 == 0:  # Log progress every 20 samples
                     self.logger('DEBUG', f'Calibration progress: {i+1}/{samples}')
             time.sleep(0.01)
 
         if valid_samples > samples * 0.8:
-            self.gyro_bias = gyro_sum / valid_samples
+            self.gyro_bias = float(buf[:valid_samples].mean())
             self.logger('INFO', f'Gyroscope calibration complete. Bias: {self.gyro_bias:.3f} deg/s')
             return True
         else:
@@ -251,17 +357,17 @@ class AOCSController:
         self.logger('INFO', 'Testing motor functionality...')
         try:
             # Test forward direction
-            GPIO.output(self.IN1, GPIO.HIGH)
-            GPIO.output(self.IN2, GPIO.LOW)
-            self.pwm.ChangeDutyCycle(30)
+            GPIO.output(self._dir_pins, (GPIO.HIGH, GPIO.LOW))
+            self.set_motor_speed(30)
             time.sleep(0.5)
 
             # Test reverse direction
-            GPIO.output(self.IN1, GPIO.LOW)
-            GPIO.output(self.IN2, GPIO.HIGH)
+            GPIO.output(self._dir_pins, (GPIO.LOW, GPIO.HIGH))
             time.sleep(0.5)
 
-            # Stop motor
+            # Stop motor (the direct pin writes above bypassed the direction setter,
+            # so drop its cached state first)
+            self._last_dir = None
             self.stop_motor()
             self.logger('INFO', 'Motor health check passed')
             return True
@@ -306,16 +412,19 @@ class AOCSController:
         """Initialise the current position as reference (0 degrees)"""
         self.logger('INFO', 'Initialising reference position...')
 
-        angle_readings = []
+        # preallocated ndarray - avoids the Python list plus the list-to-array copy
+        # that np.std would otherwise do internally
+        angle_readings = np.empty(50, dtype=np.float32)
+        count = 0
         for _ in range(50):
             gyro_data = self.read_gyro_data()
             if gyro_data is not None:
-                corrected_gyro = gyro_data['z']
-                angle_readings.append(corrected_gyro)
+                angle_readings[count] = gyro_data[2]
+                count += 1
             time.sleep(0.02)
 
-        if len(angle_readings) > 40:
-            gyro_std = np.std(angle_readings)
+        if count > 40:
+            gyro_std = float(np.std(angle_readings[:count]))
             if gyro_std < 2.0:
                 self.current_angle = 0.0
                 self.logger('INFO', f'Reference position initialised. Gyro stability: ±{gyro_std:.2f} deg/s')
@@ -346,10 +455,9 @@ class AOCSController:
         dt = 0.02
         self.is_moving = True
 
+        next_t = time.perf_counter()
         try:
             while total_rotation < target_total_rotation and self.is_moving:
-                start_time = time.time()
-
                 current_gyro = self.update_current_angle(dt)
 
                 angle_change = abs(self.current_angle - start_angle)
@@ -369,9 +477,9 @@ class AOCSController:
                     self.logger('INFO', f'Rotation: {total_rotation:.1f}°/{target_total_rotation}°, '
                                       f'Gyro: {current_gyro:.1f} deg/s, Speed: {motor_speed:.0f}%')
 
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # absolute deadline on the monotonic clock - timing errors don't accumulate
+                next_t += dt
+                time.sleep(max(0, next_t - time.perf_counter()))
 
         except Exception as e:
             self.logger('ERROR', f'360° rotation interrupted: {e}')
@@ -390,18 +498,23 @@ class AOCSController:
         self.error_sum = 0
         self.last_error = 0
 
-        tolerance = self.constants["CONTROL"]["position_tolerance"]
+        tolerance = self.position_tolerance
         settled_count = 0
         required_settled_count = 10
 
+        # bind the per-tick constants as locals - LOAD_FAST instead of LOAD_ATTR
+        # on every iteration
+        kp, ki, kd = self.Kp, self.Ki, self.Kd
+        deadzone = self.detumbling_deadzone
+
+        next_t = time.perf_counter()
         try:
             while self.is_moving:
-                start_time = time.time()
-
                 self.update_current_angle(dt)
 
+                # normalise inlined to skip the method call at 50 Hz
                 error = self.target_angle - self.current_angle
-                error = self.normalise_angle(error)
+                error = error - 360.0 * math.floor((error + 180.0) / 360.0)
 
                 if abs(error) < tolerance:
                     settled_count += 1
@@ -411,16 +524,12 @@ class AOCSController:
                 else:
                     settled_count = 0
 
-                # PID control
-                self.error_sum += error * dt
-                self.error_sum = max(-50, min(50, self.error_sum))
-
-                error_rate = (error - self.last_error) / dt if dt > 0 else 0
+                # PID control (compiled kernel when numba is available)
+                control_output, self.error_sum = pid_step(
+                    error, self.error_sum, self.last_error, kp, ki, kd, dt, 50.0
+                )
                 self.last_error = error
 
-                control_output = (self.Kp * error + self.Ki * self.error_sum + self.Kd * error_rate)
-
-                deadzone = self.constants["CONTROL"]["detumbling_deadzone"]
                 if abs(control_output) < deadzone:
                     self.stop_motor()
                 else:
@@ -435,9 +544,9 @@ class AOCSController:
                     self.logger('DEBUG', f'Current: {self.current_angle:.1f}°, Target: {self.target_angle:.1f}°, '
                                        f'Error: {error:.1f}°, Control: {control_output:.1f}')
 
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # absolute deadline on the monotonic clock - timing errors don't accumulate
+                next_t += dt
+                time.sleep(max(0, next_t - time.perf_counter()))
 
         except Exception as e:
             self.logger('ERROR', f'Movement interrupted: {e}')
@@ -459,39 +568,94 @@ class AOCSController:
             server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             server_socket.bind(('localhost', self.communication_port))
             server_socket.listen(1)
+            server_socket.setblocking(False)
 
             self.logger('INFO', f'Listening for vision system on port {self.communication_port}')
 
-            while True:
-                try:
-                    client_socket, addr = server_socket.accept()
-                    self.logger('INFO', f'Vision system connected from {addr}')
-
-                    while True:
-                        data = client_socket.recv(13)  # 4 + 4 + 1 bytes
-                        if not data:
-                            break
+            # event-driven rather than blocking in recv - the thread sleeps inside
+            # epoll and only wakes when a packet (or connection) is actually ready,
+            # so it never contends with the control loop between messages
+            sel = selectors.DefaultSelector()
+            sel.register(server_socket, selectors.EVENT_READ)
 
-                        angle_error, distance, detected_byte = struct.unpack('ffB', data)
-                        detected = bool(detected_byte)
+            client_socket = None
+            buf = bytearray(_VISION_MSG.size)
+            view = memoryview(buf)
+            received = 0
 
-                        self.vision_data = {
-                            "angle_error": angle_error,
-                            "distance": distance,
-                            "detected": detected
-                        }
-                        self.last_vision_update = time.time()
-
-                        ack = struct.pack('B', 1)
-                        client_socket.send(ack)
+            while True:
+                try:
+                    for key, _ in sel.select(timeout=0.1):
+                        if key.fileobj is server_socket:
+                            conn, addr = server_socket.accept()
+                            # one vision client at a time: drop any existing
+                            # connection first, otherwise its selector
+                            # registration leaks and its events get served
+                            # with the new socket's framing state
+                            if client_socket is not None:
+                                sel.unregister(client_socket)
+                                client_socket.close()
+                                self.logger('INFO', 'Vision system reconnected, dropping old connection')
+                            client_socket = conn
+                            client_socket.setblocking(False)
+                            # the messages are tiny - don't let Nagle sit on them
+                            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                            sel.register(client_socket, selectors.EVENT_READ)
+                            received = 0
+                            self.logger('INFO', f'Vision system connected from {addr}')
+                            continue
+
+                        # drain everything that is buffered, reassembling messages
+                        # across short reads into the preallocated buffer
+                        try:
+                            while True:
+                                n = client_socket.recv_into(view[received:])
+                                if n == 0:
+                                    sel.unregister(client_socket)
+                                    client_socket.close()
+                                    client_socket = None
+                                    self.logger('INFO', 'Vision system disconnected')
+                                    break
+                                received += n
+                                if received == _VISION_MSG.size:
+                                    received = 0
+                                    angle_error, distance, detected_byte = _VISION_MSG.unpack_from(buf)
+
+                                    # monotonic_ns - wall-clock safe, and staleness
+                                    # checks become integer compares
+                                    now_ns = time.monotonic_ns()
+                                    self._vision_q.append(
+                                        (angle_error, distance, bool(detected_byte), now_ns)
+                                    )
+                                    self.last_vision_update_ns = now_ns
+                                    with self._vision_cv:
+                                        self._vision_cv.notify_all()
+
+                                    client_socket.send(_ACK)
+                        except BlockingIOError:
+                            pass
 
                 except Exception as e:
                     self.logger('WARNING', f'Communication error: {e}')
+                    if client_socket is not None:
+                        sel.unregister(client_socket)
+                        client_socket.close()
+                        client_socket = None
                     time.sleep(1)
 
         except Exception as e:
             self.logger('ERROR', f'Communication handler error: {e}')
 
+    @property
+    def vision_data(self):
+        """Dict view of the latest vision message - for status reporting, not hot loops"""
+        angle_error, distance, detected, _ = self._vision_q[-1]
+        return {
+            "angle_error": angle_error,
+            "distance": distance,
+            "detected": detected
+        }
+
     def move_to_angle_vision_assisted(self, target_angle, max_speed=40):
         """Move to specific angle with vision assistance"""
         self.target_angle = self.normalise_angle(target_angle)
@@ -502,23 +666,26 @@ class AOCSController:
         self.error_sum = 0
         self.last_error = 0
 
-        tolerance = self.constants["CONTROL"]["docking_tolerance"]
+        tolerance = self.docking_tolerance
         settled_count = 0
         required_settled_count = 25
 
+        # bind the per-tick constants as locals, as in move_to_angle
+        kp, ki, kd = self.Kp, self.Ki, self.Kd
+
+        next_t = time.perf_counter()
         try:
             while self.is_moving:
-                start_time = time.time()
-
                 self.update_current_angle(dt)
 
+                # normalise inlined to skip the method call at 50 Hz
                 gyro_error = self.target_angle - self.current_angle
-                gyro_error = self.normalise_angle(gyro_error)
+                gyro_error = gyro_error - 360.0 * math.floor((gyro_error + 180.0) / 360.0)
 
                 final_error = gyro_error
-                if (self.vision_data["detected"] and
-                    time.time() - self.last_vision_update < 0.5):
-                    vision_error = self.vision_data["angle_error"]
+                # one atomic read gives a coherent (error, distance, detected, ts) sample
+                vision_error, _, detected, vision_ts = self._vision_q[-1]
+                if detected and time.monotonic_ns() - vision_ts < 500_000_000:
                     vision_weight = min(1.0, abs(gyro_error) / 10.0)
                     final_error = vision_weight * vision_error + (1 - vision_weight) * gyro_error
 
@@ -530,17 +697,12 @@ class AOCSController:
                 else:
                     settled_count = 0
 
-                # PID control with conservative parameters
-                self.error_sum += final_error * dt
-                self.error_sum = max(-30, min(30, self.error_sum))
-
-                error_rate = (final_error - self.last_error) / dt if dt > 0 else 0
+                # PID control with conservative parameters (compiled kernel when numba is available)
+                control_output, self.error_sum = pid_step(
+                    final_error, self.error_sum, self.last_error, kp, ki, kd, dt, 30.0
+                )
                 self.last_error = final_error
 
-                control_output = (self.Kp * final_error +
-                                self.Ki * self.error_sum +
-                                self.Kd * error_rate)
-
                 if abs(control_output) < 3:
                     self.stop_motor()
                 else:
@@ -553,9 +715,9 @@ class AOCSController:
                     self.set_motor_direction(direction)
                     self.set_motor_speed(speed)
 
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # absolute deadline on the monotonic clock - timing errors don't accumulate
+                next_t += dt
+                time.sleep(max(0, next_t - time.perf_counter()))
 
         except Exception as e:
             self.logger('ERROR', f'Movement interrupted: {e}')
@@ -571,25 +733,28 @@ class AOCSController:
 
         try:
             while self.is_docking and correction_count < max_corrections:
-                start_time = time.time()
+                start_time = time.monotonic()
 
-                if not self.vision_data["detected"]:
+                angle_error, distance, detected, vision_ts = self._vision_q[-1]
+
+                if not detected:
                     self.logger('DEBUG', 'Waiting for ArUco detection...')
-                    time.sleep(0.1)
+                    # wake as soon as the socket thread publishes a sample instead
+                    # of sleeping out a fixed poll interval
+                    with self._vision_cv:
+                        self._vision_cv.wait(0.1)
                     continue
 
-                if time.time() - self.last_vision_update > 2.0:
+                if time.monotonic_ns() - vision_ts > 2_000_000_000:
                     self.logger('WARNING', 'Vision data too old, waiting for update...')
-                    time.sleep(0.1)
+                    with self._vision_cv:
+                        self._vision_cv.wait(0.1)
                     continue
 
-                angle_error = self.vision_data["angle_error"]
-                distance = self.vision_data["distance"]
-
                 self.logger('INFO', f'Docking correction {correction_count + 1}: '
                                   f'Angle error: {angle_error:.2f}°, Distance: {distance:.2f}')
 
-                tolerance = self.constants["CONTROL"]["docking_tolerance"]
+                tolerance = self.docking_tolerance
                 if abs(angle_error) < tolerance and distance < 5.0:
                     self.logger('INFO', 'Docking successful! Target aligned.')
                     break
@@ -601,7 +766,7 @@ class AOCSController:
 
                     self.move_to_angle_vision_assisted(
                         self.current_angle + correction_angle,
-                        self.constants["CONTROL"]["docking_max_speed"]
+                        self.docking_max_speed
                     )
 
                     correction_count += 1
@@ -610,7 +775,7 @@ class AOCSController:
                     self.logger('DEBUG', 'Angle aligned, monitoring distance...')
                     time.sleep(0.2)
 
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 sleep_time = max(0, 1.0 - elapsed)
                 time.sleep(sleep_time)
 
@@ -637,41 +802,33 @@ class AOCSController:
         self.logger('INFO', 'Starting detumbling control mode...')
 
         dt = 0.01
-        error_sum = 0
-        last_error = 0
-        filtered_gyro_z = 0
+        error_sum = 0.0
+        last_error = 0.0
+        filtered_gyro_z = 0.0
         loop_count = 0
+        # locals to skip the attribute loads at 100 Hz
+        oma = self._one_minus_alpha
+        kp, ki, kd = self.Kp, self.Ki, self.Kd
+        deadzone = self.detumbling_deadzone
 
+        next_t = time.perf_counter()
         try:
             while True:
-                start_time = time.time()
-
                 # Check stop condition if provided
                 if stop_condition and stop_condition():
                     break
 
-                gyro_data = self.read_gyro_data()
-                current_gyro_z = gyro_data['z']
-
-                # Apply complementary filter
-                filtered_gyro_z = self.alpha * filtered_gyro_z + (1 - self.alpha) * current_gyro_z
-
-                # Calculate error (desired angular velocity is zero)
-                error = 0 - filtered_gyro_z
+                current_gyro_z = self.read_gyro_data()[2]
 
-                # Update integral term with anti-windup
-                error_sum += error * dt
-                error_sum = max(-50, min(50, error_sum))
-
-                # Calculate derivative term
-                error_rate = (error - last_error) / dt if dt > 0 else 0
+                # filter + PID fused into one compiled kernel - a single crossing
+                # out of the interpreter per tick (see _pid_kernels.detumble_step)
+                control_output, filtered_gyro_z, error, error_sum = detumble_step(
+                    current_gyro_z, filtered_gyro_z, oma, error_sum, last_error,
+                    kp, ki, kd, dt, 50.0
+                )
                 last_error = error
 
-                # PID control output
-                control_output = self.Kp * error + self.Ki * error_sum + self.Kd * error_rate
-
                 # Determine motor direction and speed
-                deadzone = self.constants["CONTROL"]["detumbling_deadzone"]
                 if abs(control_output) < deadzone:
                     self.stop_motor()
                     speed = 0
@@ -687,9 +844,9 @@ class AOCSController:
                                        f'Control Output: {control_output:.2f}, PWM: {speed:.1f}%')
 
                 loop_count += 1
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # absolute deadline on the monotonic clock - timing errors don't accumulate
+                next_t += dt
+                time.sleep(max(0, next_t - time.perf_counter()))
 
         except Exception as e:
             self.logger('ERROR', f'Detumbling control error: {e}')
@@ -709,8 +866,13 @@ class AOCSController:
         }
 
         try:
-            with open(filename, 'w') as f:
-                json.dump(init_data, f, indent=2)
+            # orjson serialises in C straight to bytes - much faster than json's
+            # character-at-a-time emitter if the file ever grows
+            with open(filename, 'wb') as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(init_data, option=orjson.OPT_INDENT_2))
+                else:
+                    f.write(json.dumps(init_data, indent=2).encode())
             self.logger('INFO', f'Initialisation data saved to {filename}')
             return True
         except Exception as e:
@@ -720,11 +882,12 @@ class AOCSController:
     def load_initialisation_data(self, filename="aocs_init_data.json"):
         """Load initialisation data from file"""
         try:
-            with open(filename, 'r') as f:
-                init_data = json.load(f)
-                self.gyro_bias = init_data.get("gyro_bias", 0.0)
-                self.logger('INFO', f'Loaded gyro bias: {self.gyro_bias:.3f} deg/s')
-                return True
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            init_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            self.gyro_bias = init_data.get("gyro_bias", 0.0)
+            self.logger('INFO', f'Loaded gyro bias: {self.gyro_bias:.3f} deg/s')
+            return True
         except Exception as e:
             self.logger('WARNING', f'Could not load initialisation data: {e}')
             self.gyro_bias = 0.0
@@ -739,7 +902,8 @@ class AOCSController:
             "is_docking": self.is_docking,
             "gyro_reading": self.filtered_gyro,
             "vision_data": self.vision_data,
-            "vision_age": time.time() - self.last_vision_update if self.last_vision_update > 0 else float('inf'),
+            "vision_age": ((time.monotonic_ns() - self.last_vision_update_ns) / 1e9
+                           if self.last_vision_update_ns > 0 else float('inf')),
             "status": self.status
         }
 
@@ -753,7 +917,10 @@ class AOCSController:
     def cleanup(self):
         """Clean up resources"""
         self.emergency_stop()
-        if hasattr(self, 'pwm'):
+        if getattr(self, '_pi', None) is not None:
+            self._pi.hardware_PWM(self.ENA, 0, 0)
+            self._pi.stop()
+        elif hasattr(self, 'pwm'):
             self.pwm.stop()
         GPIO.cleanup()
         self.logger('INFO', 'Cleanup completed')
@@ -766,11 +933,87 @@ def example_logger(level, message):
     print(f'[{timestamp}] {level}: {message}')
 
 
+# Command handlers for the interactive prompt - dispatched by first token
+# through a dict, so there is no prefix-matching elif chain to collide
+# ('360' vs '3600') and each handler parses its own arguments
+
+def _cmd_health(aocs, args):
+    status = aocs.system_health_check()
+    if status == 0:
+        status = aocs.initialise_reference_position()
+        if status == 1:
+            aocs.save_initialisation_data()
+            print("Health check and initialisation completed successfully")
+        else:
+            print("Initialisation failed")
+    else:
+        print("Health check failed")
+
+
+def _cmd_status(aocs, args):
+    for key, value in aocs.get_current_status().items():
+        print(f"{key}: {value}")
+
+
+def _cmd_stop(aocs, args):
+    aocs.emergency_stop()
+
+
+def _cmd_detumble(aocs, args):
+    aocs.detumbling_control()
+
+
+def _cmd_start_vision(aocs, args):
+    aocs.start_vision_communication()
+    print("Vision communication started")
+
+
+def _cmd_360(aocs, args):
+    speed = float(args[0]) if args else 30
+    aocs.rotate_360_degrees(speed)
+
+
+def _cmd_move(aocs, args):
+    if not args:
+        print("Usage: move [angle] [optional_speed]")
+        return
+    angle = float(args[0])
+    speed = float(args[1]) if len(args) > 1 else 50
+    aocs.move_to_angle(angle, speed)
+
+
+def _cmd_vision_move(aocs, args):
+    if not args:
+        print("Usage: vision_move [angle]")
+        return
+    aocs.move_to_angle_vision_assisted(float(args[0]))
+
+
+def _cmd_dock(aocs, args):
+    max_corrections = int(args[0]) if args else 50
+    success = aocs.real_time_docking(max_corrections)
+    print(f"Docking {'successful' if success else 'failed'}")
+
+
+_COMMANDS = {
+    'health': _cmd_health,
+    'status': _cmd_status,
+    'stop': _cmd_stop,
+    'detumble': _cmd_detumble,
+    'start_vision': _cmd_start_vision,
+    '360': _cmd_360,
+    'move': _cmd_move,
+    'vision_move': _cmd_vision_move,
+    'dock': _cmd_dock,
+}
+
+
 if __name__ == "__main__":
     # Load constants from file or use defaults
     try:
-        with open("constants.json", 'r') as f:
-            constants = json.load(f)
+        with open("constants.json", 'rb') as f:
+            raw = f.read()
+        constants = orjson.loads(raw) if orjson is not None else json.loads(raw)
         print("Loaded constants from constants.json")
     except Exception:
         print("Using default constants")
@@ -798,56 +1041,17 @@ if __name__ == "__main__":
             try:
                 user_input = input("Enter command: ").strip().lower()
 
+                if not user_input:
+                    continue
                 if user_input == 'quit':
                     break
-                elif user_input == 'health':
-                    status = aocs.system_health_check()
-                    if status == 0:
-                        status = aocs.initialise_reference_position()
-                        if status == 1:
-                            aocs.save_initialisation_data()
-                            print("Health check and initialisation completed successfully")
-                        else:
-                            print("Initialisation failed")
-                    else:
-                        print("Health check failed")
-                elif user_input == 'status':
-                    status = aocs.get_current_status()
-                    for key, value in status.items():
-                        print(f"{key}: {value}")
-                elif user_input == 'stop':
-                    aocs.emergency_stop()
-                elif user_input == 'detumble':
-                    aocs.detumbling_control()
-                elif user_input == 'start_vision':
-                    aocs.start_vision_communication()
-                    print("Vision communication started")
-                elif user_input.startswith('360'):
-                    parts = user_input.split()
-                    speed = float(parts[1]) if len(parts) > 1 else 30
-                    aocs.rotate_360_degrees(speed)
-                elif user_input.startswith('move'):
-                    parts = user_input.split()
-                    if len(parts) >= 2:
-                        angle = float(parts[1])
-                        speed = float(parts[2]) if len(parts) > 2 else 50
-                        aocs.move_to_angle(angle, speed)
-                    else:
-                        print("Usage: move [angle] [optional_speed]")
-                elif user_input.startswith('vision_move'):
-                    parts = user_input.split()
-                    if len(parts) >= 2:
-                        angle = float(parts[1])
-                        aocs.move_to_angle_vision_assisted(angle)
-                    else:
-                        print("Usage: vision_move [angle]")
-                elif user_input.startswith('dock'):
-                    parts = user_input.split()
-                    max_corrections = int(parts[1]) if len(parts) > 1 else 50
-                    success = aocs.real_time_docking(max_corrections)
-                    print(f"Docking {'successful' if success else 'failed'}")
-                else:
+
+                cmd, *args = user_input.split()
+                handler = _COMMANDS.get(cmd)
+                if handler is None:
                     print("Unknown command")
+                else:
+                    handler(aocs, args)
 
             except ValueError:
                 print("Invalid number format")
@@ -1,8 +1,28 @@
+import ctypes
+import os
+import struct
+import threading
 import time
 import smbus
 import RPi.GPIO as GPIO
 import numpy as np
 
+try:
+    from smbus2 import SMBus as SMBus2, i2c_msg
+except ImportError:  # smbus2 is optional - plain smbus block reads are the fallback
+    SMBus2 = None
+    i2c_msg = None
+
+try:
+    import pigpio
+except ImportError:  # pigpio is optional - software PWM via RPi.GPIO is the fallback
+    pigpio = None
+
+try:
+    from AOCS._pid_kernels import detumble_step
+except ImportError:  # standalone run from src/AOCS
+    from _pid_kernels import detumble_step
+
 # Pin Configuration based on provided pin allocation
 # L298N Motor Driver Pins
 IN1 = 17     # GPIO17 (Pin 11) - Motor direction pin 1
@@ -23,19 +43,61 @@ GYRO_ZOUT_H = 0x47
 GYRO_ZOUT_L = 0x48
 PWR_MGMT_1 = 0x6B
 GYRO_CONFIG = 0x1B
+SMPLRT_DIV = 0x19
+CONFIG = 0x1A
+INT_PIN_CFG = 0x37
+INT_ENABLE = 0x38
+
+# MPU9250 INT (data-ready) line
+INT_PIN = 4  # GPIO4 (Pin 7)
+
+# For ±250 degrees/s range, sensitivity is 131 LSB/(degrees/s)
+GYRO_SCALE = 1.0 / 131.0
+
+# Gyro sample layout - three big-endian int16s, compiled once so each read is a
+# single C-level unpack instead of per-axis shifts and sign-extension branches
+_GYRO_SAMPLE = struct.Struct('>hhh')
 
 # Setup GPIO
 GPIO.setmode(GPIO.BCM)
 GPIO.setup(ENA, GPIO.OUT)
 GPIO.setup(IN1, GPIO.OUT)
 GPIO.setup(IN2, GPIO.OUT)
+GPIO.setup(INT_PIN, GPIO.IN)
+
+# Setup PWM for motor speed control - prefer the BCM PWM peripheral via pigpio:
+# a duty-cycle update is one register write with no background toggling thread
+# and none of the software-PWM edge jitter that quantises small duty cycles
+_pi = None
+if pigpio is not None:
+    _pi_conn = pigpio.pi()
+    if _pi_conn.connected:
+        _pi = _pi_conn
+        _pi.hardware_PWM(ENA, 1000, 0)
+
+pwm = None
+if _pi is None:
+    pwm = GPIO.PWM(ENA, 1000)  # 1000 Hz frequency
+    pwm.start(0)                # Start with 0% duty cycle (motor off)
 
-# Setup PWM for motor speed control
-pwm = GPIO.PWM(ENA, 1000)  # 1000 Hz frequency
-pwm.start(0)                # Start with 0% duty cycle (motor off)
+# Data-ready handshake - the IMU's interrupt sets the event and the control loop
+# blocks on it, so each iteration reads exactly one fresh sample instead of
+# polling on a fixed sleep (which re-reads stale data and jitters the period)
+data_ready = threading.Event()
+GPIO.add_event_detect(INT_PIN, GPIO.RISING, callback=lambda _: data_ready.set())
 
-# Initialize I2C
-bus = smbus.SMBus(I2C_BUS)
+# Initialize I2C - with smbus2, each gyro sample is one combined write+read
+# transaction (repeated START) through a reused message pair instead of two
+# transfers, halving per-sample bus overhead. For higher sample rates also raise
+# the bus clock in /boot/config.txt: dtparam=i2c_arm_baudrate=400000
+if SMBus2 is not None:
+    bus = SMBus2(I2C_BUS)
+    _gyro_write = i2c_msg.write(MPU9250_ADDR, [GYRO_XOUT_H])
+    _gyro_read = i2c_msg.read(MPU9250_ADDR, 6)
+else:
+    bus = smbus.SMBus(I2C_BUS)
+    _gyro_write = None
+    _gyro_read = None
 
 # Initialize MPU9250
 def initialize_mpu9250():
@@ -47,7 +109,16 @@ def initialize_mpu9250():
         # Configure gyroscope range to ±250 degrees/s
         # 0x00 = 250 degrees/s, 0x08 = 500 degrees/s, 0x10 = 1000 degrees/s, 0x18 = 2000 degrees/s
         bus.write_byte_data(MPU9250_ADDR, GYRO_CONFIG, 0x00)
-        
+
+        # DLPF on (1 kHz internal rate) divided down to 100 Hz to match the
+        # control period, and data-ready routed to the INT pin: latched and
+        # cleared by any register read (0x20 | 0x10), so the gyro read itself
+        # rearms the line for the next edge
+        bus.write_byte_data(MPU9250_ADDR, CONFIG, 0x01)
+        bus.write_byte_data(MPU9250_ADDR, SMPLRT_DIV, 9)
+        bus.write_byte_data(MPU9250_ADDR, INT_PIN_CFG, 0x30)
+        bus.write_byte_data(MPU9250_ADDR, INT_ENABLE, 0x01)
+
         time.sleep(0.1)  # Allow time for device to stabilize
         print("MPU9250 IMU initialized successfully")
         return True
@@ -57,53 +128,59 @@ def initialize_mpu9250():
 
 # Read gyroscope data
 def read_gyro_data():
-    """Read raw gyroscope data from MPU9250"""
+    """Read gyroscope data from MPU9250 - returns (x, y, z) in degrees per second"""
     try:
         # Read 6 bytes of data from register GYRO_XOUT_H
-        data = bus.read_i2c_block_data(MPU9250_ADDR, GYRO_XOUT_H, 6)
-        
-        # Convert the data
-        gyro_x = (data[0] << 8) | data[1]
-        gyro_y = (data[2] << 8) | data[3]
-        gyro_z = (data[4] << 8) | data[5]
-        
-        # Convert to signed values
-        if gyro_x > 32767:
-            gyro_x -= 65536
-        if gyro_y > 32767:
-            gyro_y -= 65536
-        if gyro_z > 32767:
-            gyro_z -= 65536
-        
-        # Convert to degrees per second (depends on the range set in GYRO_CONFIG)
-        # For ±250 degrees/s range, sensitivity is 131 LSB/(degrees/s)
-        gyro_x = gyro_x / 131.0
-        gyro_y = gyro_y / 131.0
-        gyro_z = gyro_z / 131.0
-        
-        return {'x': gyro_x, 'y': gyro_y, 'z': gyro_z}
+        if _gyro_read is not None:
+            bus.i2c_rdwr(_gyro_write, _gyro_read)
+            raw = bytes(_gyro_read)
+        else:
+            raw = bytes(bus.read_i2c_block_data(MPU9250_ADDR, GYRO_XOUT_H, 6))
+
+        # One unpack handles byte order and sign extension for all three axes.
+        # A tuple instead of a dict - no allocation-per-read feeding the GC at 100 Hz
+        gyro_x, gyro_y, gyro_z = _GYRO_SAMPLE.unpack(raw)
+
+        return (gyro_x * GYRO_SCALE, gyro_y * GYRO_SCALE, gyro_z * GYRO_SCALE)
     except Exception as e:
         print(f"Error reading gyroscope data: {e}")
-        return {'x': 0, 'y': 0, 'z': 0}
+        return (0.0, 0.0, 0.0)
 
 # Control Parameters
 Kp = 0.8  # Proportional gain - adjust based on your system's response
 Ki = 0.1  # Integral gain
 Kd = 0.2  # Derivative gain
 
-# Filter parameters
-alpha = 0.7  # Complementary filter coefficient (0 < alpha < 1)
+# Filter parameters - the coefficient is derived from a time constant rather
+# than a bare number, so the cutoff is explicit and stays correct if the sample
+# period ever changes: alpha = Tc/(dt + Tc), 1 - alpha = dt/(dt + Tc).
+# Tc is chosen to reproduce the previously tuned alpha = 0.7 at the nominal
+# 10 ms period (~23 ms). The full two-pole complementary form needs a second
+# attitude source (accelerometer/magnetometer), which isn't wired in yet
+FILTER_TC = 0.7 * 0.01 / (1.0 - 0.7)
+alpha = FILTER_TC / (0.01 + FILTER_TC)  # at the nominal period
 
 # Variables for PID control
 error_sum = 0
 last_error = 0
 filtered_gyro_z = 0
 
+# Last values written to the hardware - the setters return early when asked for
+# what is already set, so a settled controller stops hammering GPIO/PWM at 100 Hz
+_last_dir = None
+_last_speed = -1
+
 def set_motor_direction(direction):
     """
     Sets the motor direction
     direction: 1 for forward, -1 for reverse, 0 for stop
     """
+    global _last_dir
+    direction = (direction > 0) - (direction < 0)  # normalise to -1/0/1
+    if direction == _last_dir:
+        return
+    _last_dir = direction
+
     if direction > 0:
         GPIO.output(IN1, GPIO.HIGH)
         GPIO.output(IN2, GPIO.LOW)
@@ -119,17 +196,24 @@ def set_motor_speed(speed):
     Sets the motor speed via PWM
     speed: 0-100 (percentage of maximum speed)
     """
-    # Ensure speed is within valid range
-    speed = max(0, min(100, speed))
-    pwm.ChangeDutyCycle(speed)
+    global _last_speed
+    # whole percent - sub-1% PID jitter shouldn't trigger a PWM update per tick
+    speed = int(round(max(0, min(100, speed))))
+    if speed == _last_speed:
+        return
+    _last_speed = speed
+
+    if _pi is not None:
+        _pi.hardware_PWM(ENA, 1000, speed * 10_000)  # duty in millionths
+    else:
+        pwm.ChangeDutyCycle(speed)
 
 def read_angular_velocity():
     """
     Reads angular velocity from the IMU
     Returns: angular velocity around z-axis in degrees per second
     """
-    gyro = read_gyro_data()
-    return gyro['z']  # Extract z-axis angular velocity
+    return read_gyro_data()[2]  # Extract z-axis angular velocity
 
 def detumbling_control():
     """
@@ -137,59 +221,119 @@ def detumbling_control():
     """
     global error_sum, last_error, filtered_gyro_z
     
+    # Pin the loop to core 3 - paired with isolcpus=3 nohz_full=3 rcu_nocbs=3
+    # on the kernel command line it gets a core to itself, free of background
+    # kthreads, other processes' GC and cross-core cache traffic
+    try:
+        os.sched_setaffinity(0, {3})
+    except OSError:
+        pass  # fewer than four cores available
+
+    # Pin the loop above ordinary kernel threads and lock pages in RAM -
+    # scheduling jitter feeds straight into the Kd term, and a page fault
+    # mid-iteration is worse than any bytecode cost. Needs root; degrade to
+    # normal scheduling otherwise
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(80))
+        ctypes.CDLL("libc.so.6", use_errno=True).mlockall(3)  # MCL_CURRENT | MCL_FUTURE
+    except (PermissionError, OSError) as e:
+        print(f"Real-time scheduling unavailable, continuing without it: {e}")
+
     try:
         print("Starting detumbling control mode...")
         print("Press Ctrl+C to stop")
         
-        # Control loop
-        dt = 0.01  # 10ms control period
+        # Control loop - paced by the IMU's 100 Hz data-ready interrupt
+        dt = 0.01  # nominal 10ms control period (SMPLRT_DIV)
+        loop_count = 0
+        oma = 1.0 - alpha
+
+        # bind the per-tick names as locals - LOAD_FAST instead of LOAD_GLOBAL
+        # on every iteration
+        kp, ki, kd = Kp, Ki, Kd
+        step = detumble_step
+
+        # warm the kernel before entering the loop so the first real tick
+        # doesn't pay the (one-off) numba compile
+        detumble_step(0.0, 0.0, oma, 0.0, 0.0, Kp, Ki, Kd, dt, 50.0)
+
+        prev_ns = time.monotonic_ns()
         while True:
-            start_time = time.time()
-            
+            # block until a fresh sample is ready; on timeout fall through and
+            # read anyway, so a miswired INT line or a stalled IMU degrades to
+            # 10 Hz polled control instead of freezing the last motor command
+            data_ready.wait(timeout=0.1)
+            data_ready.clear()
+
+            # integrate and differentiate over the measured inter-sample time
+            # (monotonic, so NTP steps can't touch it) - a late wakeup or missed
+            # interrupt then scales the I and D terms instead of corrupting them
+            now_ns = time.monotonic_ns()
+            dt = (now_ns - prev_ns) * 1e-9
+            prev_ns = now_ns
+            # the ceiling sits above the 0.1 s slow-poll interval so those
+            # ticks keep their real dt; only a genuine stall gets clamped
+            if not 0.0 < dt < 0.2:  # first pass / stall recovery
+                dt = 0.01
+
+            # discretise the filter for the measured period, not the nominal one
+            oma = dt / (dt + FILTER_TC)
+
             # Read current angular velocity
             current_gyro_z = read_angular_velocity()
-            
-            # Apply complementary filter to smooth readings
-            filtered_gyro_z = alpha * filtered_gyro_z + (1 - alpha) * current_gyro_z
-            
-            # Calculate error (desired angular velocity is zero)
-            error = 0 - filtered_gyro_z
-            
-            # Update integral term with anti-windup
-            error_sum += error * dt
-            error_sum = max(-50, min(50, error_sum))  # Limit integral term
-            
-            # Calculate derivative term
-            error_rate = (error - last_error) / dt if dt > 0 else 0
+
+            # Complementary filter + PID in one compiled kernel (native code when
+            # numba is installed) - a single crossing out of the interpreter for
+            # all the per-tick arithmetic
+            control_output, filtered_gyro_z, error, error_sum = step(
+                current_gyro_z, filtered_gyro_z, oma, error_sum, last_error,
+                kp, ki, kd, dt, 50.0
+            )
             last_error = error
             
-            # PID control output
-            control_output = Kp * error + Ki * error_sum + Kd * error_rate
-            
             # Determine motor direction and speed
             if abs(control_output) < 5:
                 # Dead zone to prevent motor oscillation at low speeds
                 set_motor_direction(0)
                 set_motor_speed(0)
+                speed = 0
+                in_deadband = True
             else:
+                in_deadband = False
                 direction = 1 if control_output > 0 else -1
                 speed = min(abs(control_output), 100)  # Limit to valid PWM range
                 set_motor_direction(direction)
                 set_motor_speed(speed)
+
+            # Nearly detumbled with the motor parked - the steady-state case.
+            # Drop to a 100 ms poll until the rate leaves a small band around
+            # zero: a tenfold cut in I2C traffic and wakeups while there is
+            # nothing to actuate. The measured dt keeps the filter correct
+            # across the longer interval
+            if in_deadband and abs(filtered_gyro_z) < 2.0:
+                # clear first: the gyro read above already rearmed the latched
+                # INT line, so the next edge lands during the sleep, the wait
+                # at the top of the loop returns immediately and the tick
+                # measures its true ~0.1 s dt. Clearing after the sleep would
+                # discard that edge and force a second 0.1 s timeout
+                data_ready.clear()
+                time.sleep(0.1)
             
-            # Debug output
-            print(f"Angular Velocity: {filtered_gyro_z:.2f} deg/s, Control Output: {control_output:.2f}, PWM: {speed:.1f}%")
-            
-            # Calculate loop time and sleep to maintain consistent dt
-            elapsed = time.time() - start_time
-            sleep_time = max(0, dt - elapsed)
-            time.sleep(sleep_time)
+            # Debug output every 50 loops - at 100 Hz, formatting and writing a
+            # line per iteration costs as much as the PID arithmetic itself
+            if loop_count % 50 == 0:
+                print(f"Angular Velocity: {filtered_gyro_z:.2f} deg/s, Control Output: {control_output:.2f}, PWM: {speed:.1f}%")
+            loop_count += 1
             
     except KeyboardInterrupt:
         print("Detumbling control stopped by user")
     finally:
         # Cleanup
-        pwm.stop()
+        if _pi is not None:
+            _pi.hardware_PWM(ENA, 0, 0)
+            _pi.stop()
+        else:
+            pwm.stop()
         GPIO.cleanup()
         print("GPIO cleaned up")
 
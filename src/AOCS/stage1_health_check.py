@@ -1,9 +1,27 @@
+import os
+import struct
 import time
 import smbus
 import RPi.GPIO as GPIO
 import numpy as np
 import json
 
+try:
+    from smbus2 import SMBus as SMBus2, i2c_msg
+except ImportError:  # smbus2 is optional - plain smbus block reads are the fallback
+    SMBus2 = None
+    i2c_msg = None
+
+try:
+    import pigpio
+except ImportError:  # pigpio is optional - software PWM via RPi.GPIO is the fallback
+    pigpio = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - the stdlib serialiser is the fallback
+    orjson = None
+
 # Pin Configuration (same as detumbling script)
 IN1 = 17     # GPIO17 (Pin 11) - Motor direction pin 1
 IN2 = 27     # GPIO27 (Pin 13) - Motor direction pin 2
@@ -22,6 +40,20 @@ GYRO_ZOUT_H = 0x47
 GYRO_ZOUT_L = 0x48
 PWR_MGMT_1 = 0x6B
 GYRO_CONFIG = 0x1B
+SMPLRT_DIV = 0x19
+CONFIG = 0x1A
+FIFO_EN = 0x23
+USER_CTRL = 0x6A
+FIFO_COUNT_H = 0x72
+FIFO_COUNT_L = 0x73
+FIFO_R_W = 0x74
+
+# For ±250 degrees/s range, sensitivity is 131 LSB/(degrees/s)
+GYRO_SCALE = 1.0 / 131.0
+
+# Gyro sample layout - three big-endian int16s, compiled once so each read is a
+# single C-level unpack instead of per-axis shifts and sign-extension branches
+_GYRO_SAMPLE = struct.Struct('>hhh')
 
 class AOCSHealthCheck:
     def __init__(self):
@@ -42,9 +74,19 @@ class AOCSHealthCheck:
             GPIO.setup(IN1, GPIO.OUT)
             GPIO.setup(IN2, GPIO.OUT)
 
-            # Setup PWM for motor speed control
-            self.pwm = GPIO.PWM(ENA, 1000)
-            self.pwm.start(0)
+            # Setup PWM for motor speed control - prefer the BCM PWM peripheral
+            # via pigpio (single register write per update, no software-PWM
+            # toggling thread or edge jitter)
+            self._pi = None
+            if pigpio is not None:
+                pi = pigpio.pi()
+                if pi.connected:
+                    self._pi = pi
+                    self._pi.hardware_PWM(ENA, 1000, 0)
+
+            if self._pi is None:
+                self.pwm = GPIO.PWM(ENA, 1000)
+                self.pwm.start(0)
 
             # Ensure motor is stopped initially
             GPIO.output(IN1, GPIO.LOW)
@@ -59,12 +101,30 @@ class AOCSHealthCheck:
     def setup_i2c(self):
         """Setup I2C communication with MPU9250"""
         try:
-            self.bus = smbus.SMBus(I2C_BUS)
+            # with smbus2, each gyro sample is one combined write+read transaction
+            # (repeated START) through a reused message pair instead of two
+            # transfers. For higher sample rates also raise the bus clock in
+            # /boot/config.txt: dtparam=i2c_arm_baudrate=400000
+            self._gyro_msgs = None
+            if SMBus2 is not None:
+                self.bus = SMBus2(I2C_BUS)
+                self._gyro_msgs = (i2c_msg.write(MPU9250_ADDR, [GYRO_XOUT_H]),
+                                   i2c_msg.read(MPU9250_ADDR, 6))
+            else:
+                self.bus = smbus.SMBus(I2C_BUS)
             return True
         except Exception as e:
             print(f"I2C setup failed: {e}")
             return False
 
+    def set_motor_speed(self, speed):
+        """Set motor speed (0-100%) through whichever PWM backend is active"""
+        speed = max(0, min(100, speed))
+        if self._pi is not None:
+            self._pi.hardware_PWM(ENA, 1000, int(speed * 10_000))  # duty in millionths
+        else:
+            self.pwm.ChangeDutyCycle(speed)
+
     def initialize_mpu9250(self):
         """Initialize the MPU9250 IMU"""
         try:
@@ -82,49 +142,54 @@ class AOCSHealthCheck:
             return False
 
     def read_gyro_data(self):
-        """Read raw gyroscope data from MPU9250"""
-        try:
-            data = self.bus.read_i2c_block_data(MPU9250_ADDR, GYRO_XOUT_H, 6)
-
-            # Convert the data
-            gyro_x = (data[0] << 8) | data[1]
-            gyro_y = (data[2] << 8) | data[3]
-            gyro_z = (data[4] << 8) | data[5]
-
-            # Convert to signed values
-            if gyro_x > 32767: gyro_x -= 65536
-            if gyro_y > 32767: gyro_y -= 65536
-            if gyro_z > 32767: gyro_z -= 65536
+        """
+        Read gyroscope data from MPU9250 - returns (x, y, z) in degrees per second
+
+        Propagates OSError on a bus failure: errors are rare, so callers catch
+        them where a missed sample matters and the common path carries no
+        sentinel check per read
+        """
+        if self._gyro_msgs is not None:
+            write_msg, read_msg = self._gyro_msgs
+            self.bus.i2c_rdwr(write_msg, read_msg)
+            raw = bytes(read_msg)
+        else:
+            raw = bytes(self.bus.read_i2c_block_data(MPU9250_ADDR, GYRO_XOUT_H, 6))
 
-            # Convert to degrees per second
-            gyro_x = gyro_x / 131.0
-            gyro_y = gyro_y / 131.0
-            gyro_z = gyro_z / 131.0
+        # One unpack handles byte order and sign extension for all three axes.
+        # A tuple instead of a dict - no allocation-per-read feeding the GC
+        gyro_x, gyro_y, gyro_z = _GYRO_SAMPLE.unpack(raw)
 
-            return {'x': gyro_x, 'y': gyro_y, 'z': gyro_z}
-        except Exception as e:
-            print(f"Error reading gyroscope data: {e}")
-            return None
+        return (gyro_x * GYRO_SCALE, gyro_y * GYRO_SCALE, gyro_z * GYRO_SCALE)
 
     def motor_health_check(self):
         """Test motor functionality"""
         print("Testing motor functionality...")
         try:
-            # Test forward direction
-            GPIO.output(IN1, GPIO.HIGH)
-            GPIO.output(IN2, GPIO.LOW)
-            self.pwm.ChangeDutyCycle(30)  # Low speed test
-            time.sleep(0.5)
-
-            # Test reverse direction
-            GPIO.output(IN1, GPIO.LOW)
-            GPIO.output(IN2, GPIO.HIGH)
-            time.sleep(0.5)
+            # Test forward direction - 50 ms is plenty for the wheel to spin up,
+            # and reading the gyro makes this a real functional check instead of
+            # an open-loop half-second delay in the boot path
+            GPIO.output((IN1, IN2), (GPIO.HIGH, GPIO.LOW))
+            self.set_motor_speed(30)  # Low speed test
+            time.sleep(0.05)
+            forward_rate = self.read_gyro_data()[2]
+            if abs(forward_rate) < 3.0:
+                raise RuntimeError("no rotation measured in forward direction")
+
+            # Test reverse direction - signed check: 50 ms after the flip the
+            # body still carries the forward momentum, so |rate| alone would
+            # pass with reverse drive dead. Require the rate to have moved
+            # against the forward direction instead
+            GPIO.output((IN1, IN2), (GPIO.LOW, GPIO.HIGH))
+            time.sleep(0.05)
+            reverse_rate = self.read_gyro_data()[2]
+            delta = forward_rate - reverse_rate
+            if (delta if forward_rate > 0 else -delta) < 3.0:
+                raise RuntimeError("reverse drive did not counter forward rotation")
 
             # Stop motor
-            GPIO.output(IN1, GPIO.LOW)
-            GPIO.output(IN2, GPIO.LOW)
-            self.pwm.ChangeDutyCycle(0)
+            GPIO.output((IN1, IN2), (GPIO.LOW, GPIO.LOW))
+            self.set_motor_speed(0)
 
             print("Motor health check passed")
             return True
@@ -137,53 +202,80 @@ class AOCSHealthCheck:
         print(f"Calibrating gyroscope with {samples} samples...")
         print("Please keep the CubeSat stationary during calibration...")
 
-        gyro_sum = 0.0
-        valid_samples = 0
+        # One direct read up front stands in for the old 10-sample warm-up loop:
+        # it proves the bus and gyro are alive before committing to the FIFO run
+        try:
+            self.read_gyro_data()
+        except OSError as e:
+            print(f"Gyroscope readings unstable: {e}")
+            return False
 
-        for i in range(samples):
-            gyro_data = self.read_gyro_data()
-            if gyro_data is not None:
-                gyro_sum += gyro_data['z']
-                valid_samples += 1
-                print(f"Calibration progress: {i+1}/{samples}", end='\r')
-            time.sleep(0.01)
+        try:
+            # Let the IMU do the sampling: gyro X/Y/Z routed into the onboard FIFO
+            # at 100 Hz (DLPF on) while we sleep once, then drained in 30-byte
+            # bursts - a handful of I2C transactions instead of one per sample,
+            # and no Python sleep jitter in the bias estimate. The 512-byte FIFO
+            # caps a run at ~85 samples, still comfortably above the 80% floor
+            self.bus.write_byte_data(MPU9250_ADDR, CONFIG, 0x01)
+            self.bus.write_byte_data(MPU9250_ADDR, SMPLRT_DIV, 9)
+            self.bus.write_byte_data(MPU9250_ADDR, USER_CTRL, 0x44)  # enable + reset FIFO
+            self.bus.write_byte_data(MPU9250_ADDR, FIFO_EN, 0x70)    # gyro X/Y/Z -> FIFO
+
+            time.sleep(samples * 0.01)
+
+            self.bus.write_byte_data(MPU9250_ADDR, FIFO_EN, 0x00)    # stop filling
+
+            count = ((self.bus.read_byte_data(MPU9250_ADDR, FIFO_COUNT_H) << 8) |
+                     self.bus.read_byte_data(MPU9250_ADDR, FIFO_COUNT_L))
+            count -= count % 6  # whole samples only
+
+            chunks = []
+            drained = 0
+            while drained < count:
+                n = min(30, count - drained)  # 5 samples per burst
+                chunks.append(bytes(self.bus.read_i2c_block_data(MPU9250_ADDR, FIFO_R_W, n)))
+                drained += n
+
+            self.bus.write_byte_data(MPU9250_ADDR, USER_CTRL, 0x00)
+
+            gyro = np.frombuffer(b''.join(chunks), dtype='>i2').reshape(-1, 3)
+            valid_samples = len(gyro)
+        except Exception as e:
+            print(f"Gyroscope calibration failed: {e}")
+            return False
 
-        if valid_samples > samples * 0.8:  # At least 80% valid samples
-            self.gyro_bias = gyro_sum / valid_samples
-            print(f"\nGyroscope calibration complete. Bias: {self.gyro_bias:.3f} deg/s")
+        if valid_samples > min(samples, 85) * 0.8:  # At least 80% valid samples
+            self.gyro_bias = float(gyro[:, 2].mean()) * GYRO_SCALE
+            print(f"Gyroscope calibration complete. Bias: {self.gyro_bias:.3f} deg/s")
             return True
         else:
-            print(f"\nGyroscope calibration failed. Only {valid_samples}/{samples} valid samples")
+            print(f"Gyroscope calibration failed. Only {valid_samples}/{samples} valid samples")
             return False
 
     def system_health_check(self):
         """Comprehensive system health check"""
         print("=== AOCS Health Check Started ===")
 
+        # Pin to core 3 (the core the control loops also use) so the timing of
+        # the calibration run matches flight conditions; harmless if unavailable
+        try:
+            os.sched_setaffinity(0, {3})
+        except OSError:
+            pass
+
         # Check 1: IMU Initialization
         if not self.initialize_mpu9250():
             self.status = -1
             return self.status
 
-        # Check 2: Gyroscope readings
-        gyro_test_count = 0
-        for _ in range(10):
-            gyro_data = self.read_gyro_data()
-            if gyro_data is not None:
-                gyro_test_count += 1
-            time.sleep(0.1)
-
-        if gyro_test_count < 8:
-            print("Gyroscope readings unstable")
-            self.status = -1
-            return self.status
-
-        # Check 3: Motor functionality
+        # Check 2: Motor functionality
         if not self.motor_health_check():
             self.status = -1
             return self.status
 
-        # Check 4: Gyroscope calibration
+        # Check 3: Gyroscope readings and calibration - the FIFO calibration run
+        # itself proves the gyro streams valid samples, so the old separate
+        # 10-read warm-up (a full second of I2C and sleeps) is folded into it
         if not self.calibrate_gyroscope():
             self.status = -1
             return self.status
@@ -196,26 +288,32 @@ class AOCSHealthCheck:
         """Initialize the current position as reference (0 degrees)"""
         print("Initializing reference position...")
 
-        # Take several readings to establish initial position
-        angle_readings = []
+        # Take several readings to establish initial position - preallocated
+        # ndarray, so no per-sample list growth and no list-to-array copy when
+        # np.std runs at the end
+        angle_readings = np.empty(50, dtype=np.float32)
+        count = 0
         for _ in range(50):
-            gyro_data = self.read_gyro_data()
-            if gyro_data is not None:
+            try:
                 # Correct for bias
-                corrected_gyro = gyro_data['z'] - self.gyro_bias
-                angle_readings.append(corrected_gyro)
+                angle_readings[count] = self.read_gyro_data()[2] - self.gyro_bias
+                count += 1
+            except OSError:
+                pass  # missed sample - the >40 floor below covers it
             time.sleep(0.02)
 
-        if len(angle_readings) > 40:
-            # Check if system is relatively stationary
-            gyro_std = np.std(angle_readings)
-            if gyro_std < 2.0:  # Less than 2 deg/s standard deviation
+        if count > 40:
+            # Check if system is relatively stationary - compare variance against
+            # the squared threshold, skipping np.std's extra sqrt pass; the sqrt
+            # only runs once for the printed figure
+            gyro_var = float(angle_readings[:count].var())
+            if gyro_var < 4.0:  # Less than 2 deg/s standard deviation
                 self.initial_angle = 0.0  # Set current position as reference
-                print(f"Reference position initialized. Gyro stability: ±{gyro_std:.2f} deg/s")
+                print(f"Reference position initialized. Gyro stability: ±{gyro_var ** 0.5:.2f} deg/s")
                 self.status = 1  # Initialization complete
                 return self.status
             else:
-                print(f"System not stable enough for initialization. Gyro std: {gyro_std:.2f} deg/s")
+                print(f"System not stable enough for initialization. Gyro std: {gyro_var ** 0.5:.2f} deg/s")
                 self.status = -1
                 return self.status
         else:
@@ -239,7 +337,10 @@ class AOCSHealthCheck:
     def cleanup(self):
         """Clean up GPIO and resources"""
         try:
-            if hasattr(self, 'pwm'):
+            if getattr(self, '_pi', None) is not None:
+                self._pi.hardware_PWM(ENA, 0, 0)
+                self._pi.stop()
+            elif hasattr(self, 'pwm'):
                 self.pwm.stop()
             GPIO.cleanup()
             print("Cleanup completed")
@@ -256,8 +357,12 @@ class AOCSHealthCheck:
         }
 
         try:
-            with open(filename, 'w') as f:
-                json.dump(init_data, f, indent=2)
+            # orjson serialises in C straight to bytes; stdlib json is the fallback
+            with open(filename, 'wb') as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(init_data, option=orjson.OPT_INDENT_2))
+                else:
+                    f.write(json.dumps(init_data, indent=2).encode())
             print(f"Initialization data saved to {filename}")
         except Exception as e:
             print(f"Failed to save initialization data: {e}")
@@ -1,10 +1,34 @@
+import math
+import struct
 import time
 import smbus
 import RPi.GPIO as GPIO
 import numpy as np
 import json
 import threading
+from collections import deque
 from queue import Queue
+from typing import NamedTuple
+
+try:
+    from smbus2 import SMBus as SMBus2, i2c_msg
+except ImportError:  # smbus2 is optional - fall back to plain smbus block reads
+    SMBus2 = None
+
+try:
+    import pigpio
+except ImportError:  # pigpio is optional - fall back to software-timed RPi.GPIO
+    pigpio = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib json module
+    orjson = None
+
+try:
+    from AOCS._pid_kernels import pid_step
+except ImportError:  # running as a script from inside src/AOCS
+    from _pid_kernels import pid_step
 
 # Pin Configuration (same as previous scripts)
 IN1 = 17     # GPIO17 (Pin 11) - Motor direction pin 1
@@ -13,9 +37,10 @@ ENA = 18     # GPIO18 (Pin 12) - PWM pin for controlling motor speed (EnA)
 
 # MPU9250 I2C Configuration
 MPU9250_ADDR = 0x68
-I2C_BUS = 1fff
+I2C_BUS = 1
 
 # MPU9250 Register Addresses
+ACCEL_XOUT_H = 0x3B
 GYRO_XOUT_H = 0x43
 GYRO_XOUT_L = 0x44
 GYRO_YOUT_H = 0x45
@@ -24,6 +49,30 @@ GYRO_ZOUT_H = 0x47
 GYRO_ZOUT_L = 0x48
 PWR_MGMT_1 = 0x6B
 GYRO_CONFIG = 0x1B
+SMPLRT_DIV = 0x19
+CONFIG = 0x1A
+INT_PIN_CFG = 0x37
+INT_ENABLE = 0x38
+
+INT_PIN = 4  # GPIO4 (Pin 7) - MPU9250 INT, asserts on data ready
+
+GYRO_SCALE = 1.0 / 131.0  # +/-250 dps range: LSB -> deg/s
+
+# Compiled once; decodes the full accel+temp+gyro burst (seven big-endian
+# int16 channels) in one C call
+_IMU_BURST = struct.Struct('>7h')
+
+class Position(NamedTuple):
+    """Immutable snapshot of the positioning state
+
+    A tuple instead of a per-call dict so a telemetry poller can grab it at
+    rate without generating garbage
+    """
+    current_angle: float
+    target_angle: float
+    is_moving: bool
+    gyro_reading: float
+
 
 class AOCSPositioning:
     def __init__(self):
@@ -38,85 +87,207 @@ class AOCSPositioning:
         self.Ki = 0.05
         self.Kd = 0.15
 
-        # PID variables
-        self.error_sum = 0
-        self.last_error = 0
+        # PID variables (floats keep the jitted kernel signature stable)
+        self.error_sum = 0.0
+        self.last_error = 0.0
 
-        # Filter parameters
-        self.alpha = 0.8
+        # Filter parameters: the old alpha = 0.8 at the nominal 20 ms tick,
+        # expressed as a time constant (~80 ms) so the discretisation can track
+        # the measured loop interval
+        self.filter_tc = 0.8 * 0.02 / (1.0 - 0.8)
         self.filtered_gyro = 0.0
 
+        # Last motor state written to the pins; lets the setters skip the
+        # GPIO/PWM call entirely when the command has not changed
+        self._dir_pins = [IN1, IN2]
+        self._last_dir = None
+        self._last_speed = -1
+
+        # Latest gyro sample from the producer thread: (rate deg/s, monotonic_ns).
+        # Single-slot deque so append/[-1] are atomic under the GIL, no lock needed
+        self._gyro_q = deque([(0.0, 0)], maxlen=1)
+        self._imu_running = False
+        self._imu_thread = None
+        self._data_ready = threading.Event()
+
         # Initialize hardware
         self.setup_gpio()
         self.setup_i2c()
         self.initialize_mpu9250()
         self.load_initialization_data()
+        self.start_imu_sampler()
+
+        # Executor thread for movement commands; keeps the CLI thread free so
+        # an emergency stop can actually interrupt a move in progress
+        self._command_thread = threading.Thread(target=self._command_worker,
+                                                daemon=True)
+        self._command_thread.start()
 
     def setup_gpio(self):
-        """Setup GPIO pins for motor control"""
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(ENA, GPIO.OUT)
-        GPIO.setup(IN1, GPIO.OUT)
-        GPIO.setup(IN2, GPIO.OUT)
+        """Setup GPIO pins for motor control
 
-        self.pwm = GPIO.PWM(ENA, 1000)
-        self.pwm.start(0)
+        pigpio is preferred when its daemon is running: ENA gets DMA-driven
+        hardware PWM with microsecond jitter and the direction pins become
+        single register writes. The software-timed RPi.GPIO PWM thread is
+        kept as a fallback
+        """
+        self._pi = None
+        self.pwm = None
+        if pigpio is not None:
+            pi = pigpio.pi()
+            if pi.connected:
+                self._pi = pi
+                pi.set_mode(IN1, pigpio.OUTPUT)
+                pi.set_mode(IN2, pigpio.OUTPUT)
+                pi.hardware_PWM(ENA, 1000, 0)
+                pi.set_mode(INT_PIN, pigpio.INPUT)
+                self._int_cb = pi.callback(
+                    INT_PIN, pigpio.RISING_EDGE,
+                    lambda gpio, level, tick: self._data_ready.set())
+
+        if self._pi is None:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(ENA, GPIO.OUT)
+            GPIO.setup(IN1, GPIO.OUT)
+            GPIO.setup(IN2, GPIO.OUT)
+            GPIO.setup(INT_PIN, GPIO.IN)
+            GPIO.add_event_detect(INT_PIN, GPIO.RISING,
+                                  callback=lambda _: self._data_ready.set())
+
+            self.pwm = GPIO.PWM(ENA, 1000)
+            self.pwm.start(0)
 
         # Ensure motor is stopped
         self.stop_motor()
 
     def setup_i2c(self):
-        """Setup I2C communication"""
-        self.bus = smbus.SMBus(I2C_BUS)
+        """Setup I2C communication
+
+        The bus clock itself is boot configuration, not runtime code: with
+        dtparam=i2c_arm_baudrate=400000 in /boot/config.txt the MPU9250 runs
+        in 400 kHz fast mode and each sample read takes well under 250 us
+        """
+        if SMBus2 is not None:
+            self.bus = SMBus2(I2C_BUS)
+            # Preallocated write/read pair, reused every tick; i2c_rdwr issues
+            # both as one combined repeated-START transaction (one ioctl)
+            self._imu_msgs = (i2c_msg.write(MPU9250_ADDR, [ACCEL_XOUT_H]),
+                              i2c_msg.read(MPU9250_ADDR, 14))
+            self._read_block = None
+        else:
+            self.bus = smbus.SMBus(I2C_BUS)
+            self._imu_msgs = None
+            # Bound method cached once so the read path skips attribute lookups
+            self._read_block = self.bus.read_i2c_block_data
 
     def initialize_mpu9250(self):
         """Initialize the MPU9250 IMU"""
         self.bus.write_byte_data(MPU9250_ADDR, PWR_MGMT_1, 0x00)
         self.bus.write_byte_data(MPU9250_ADDR, GYRO_CONFIG, 0x00)
+        # 184 Hz DLPF, sample divider 9 -> 100 Hz output data rate
+        self.bus.write_byte_data(MPU9250_ADDR, CONFIG, 0x01)
+        self.bus.write_byte_data(MPU9250_ADDR, SMPLRT_DIV, 9)
+        # INT: latched and cleared by any register read (0x20 | 0x10), so the
+        # gyro read itself rearms the line; fire on data ready
+        self.bus.write_byte_data(MPU9250_ADDR, INT_PIN_CFG, 0x30)
+        self.bus.write_byte_data(MPU9250_ADDR, INT_ENABLE, 0x01)
         time.sleep(0.1)
 
     def load_initialization_data(self):
         """Load initialization data from Stage 1"""
         try:
-            with open("aocs_init_data.json", 'r') as f:
-                init_data = json.load(f)
-                self.gyro_bias = init_data.get("gyro_bias", 0.0)
-                print(f"Loaded gyro bias: {self.gyro_bias:.3f} deg/s")
-        except Exception as e:
+            with open("aocs_init_data.json", 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            # Only the read is guarded; a corrupt file should fail loudly
             print(f"Warning: Could not load initialization data: {e}")
             self.gyro_bias = 0.0
+            return
+
+        init_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        self.gyro_bias = init_data.get("gyro_bias", 0.0)
+        print(f"Loaded gyro bias: {self.gyro_bias:.3f} deg/s")
+
+    def read_imu_burst(self):
+        """Read accel, temperature and gyro in one 14-byte bus transaction
+
+        A single burst from ACCEL_XOUT_H covers all seven int16 channels, so
+        accel and gyro are sampled within the same bus frame - half the
+        transactions of reading them separately, and temporally coherent
+        inputs if the channels are ever fused. Returns the raw counts as
+        (ax, ay, az, temp, gx, gy, gz)
+        """
+        if self._imu_msgs is not None:
+            self.bus.i2c_rdwr(*self._imu_msgs)
+            raw = bytes(self._imu_msgs[1])
+        else:
+            raw = bytes(self._read_block(MPU9250_ADDR, ACCEL_XOUT_H, 14))
+        return _IMU_BURST.unpack(raw)
 
     def read_gyro_data(self):
         """Read gyroscope data"""
         try:
-            data = self.bus.read_i2c_block_data(MPU9250_ADDR, GYRO_XOUT_H, 6)
-
-            gyro_z = (data[4] << 8) | data[5]
-            if gyro_z > 32767:
-                gyro_z -= 65536
-
-            gyro_z = gyro_z / 131.0 - self.gyro_bias
-            return gyro_z
+            return self.read_imu_burst()[6] * GYRO_SCALE - self.gyro_bias
         except Exception as e:
             print(f"Error reading gyroscope: {e}")
             return 0.0
 
+    def start_imu_sampler(self):
+        """Start the background thread that keeps the latest gyro sample fresh"""
+        if self._imu_thread is not None and self._imu_thread.is_alive():
+            return
+        self._imu_running = True
+        self._imu_thread = threading.Thread(target=self._imu_sampler, daemon=True)
+        self._imu_thread.start()
+
+    def _imu_sampler(self):
+        """Producer: publish one gyro sample per data-ready interrupt
+
+        The MPU9250 INT pin paces this thread at the sensor's own 100 Hz
+        output rate, so samples are phase-locked to the hardware instead of
+        drifting against a sleep-based schedule. The 0.1 s wait timeout keeps
+        the thread alive (at 10 Hz polling) if the INT line is not wired.
+        Only this thread touches the I2C bus once it is running, so the
+        control loops never block on a bus transaction
+        """
+        publish = self._gyro_q.append
+        wait = self._data_ready.wait
+        clear = self._data_ready.clear
+        while self._imu_running:
+            wait(0.1)
+            clear()
+            publish((self.read_gyro_data(), time.monotonic_ns()))
+
     def set_motor_direction(self, direction):
         """Set motor direction: 1=forward, -1=reverse, 0=stop"""
-        if direction > 0:
-            GPIO.output(IN1, GPIO.HIGH)
-            GPIO.output(IN2, GPIO.LOW)
+        direction = (direction > 0) - (direction < 0)
+        if direction == self._last_dir:
+            return
+        self._last_dir = direction
+        if self._pi is not None:
+            self._pi.write(IN1, 1 if direction > 0 else 0)
+            self._pi.write(IN2, 1 if direction < 0 else 0)
+        elif direction > 0:
+            GPIO.output(self._dir_pins, (GPIO.HIGH, GPIO.LOW))
         elif direction < 0:
-            GPIO.output(IN1, GPIO.LOW)
-            GPIO.output(IN2, GPIO.HIGH)
+            GPIO.output(self._dir_pins, (GPIO.LOW, GPIO.HIGH))
         else:
-            GPIO.output(IN1, GPIO.LOW)
-            GPIO.output(IN2, GPIO.LOW)
+            GPIO.output(self._dir_pins, (GPIO.LOW, GPIO.LOW))
 
     def set_motor_speed(self, speed):
         """Set motor speed (0-100%)"""
-        speed = max(0, min(100, abs(speed)))
-        self.pwm.ChangeDutyCycle(speed)
+        # Inline clamp: conditional expressions instead of abs/min/max calls
+        speed = -speed if speed < 0 else speed
+        speed = 100.0 if speed > 100.0 else speed
+        speed = int(round(speed))
+        if speed == self._last_speed:
+            return
+        self._last_speed = speed
+        if self._pi is not None:
+            # pigpio expresses duty in units of 1e-6
+            self._pi.hardware_PWM(ENA, 1000, int(speed * 10_000))
+        else:
+            self.pwm.ChangeDutyCycle(speed)
 
     def stop_motor(self):
         """Stop the motor"""
@@ -125,26 +296,33 @@ class AOCSPositioning:
 
     def normalize_angle(self, angle):
         """Normalize angle to [-180, 180] range"""
-        while angle > 180:
-            angle -= 360
-        while angle < -180:
-            angle += 360
-        return angle
+        # Branchless: constant cost regardless of how far the angle has wound up,
+        # unlike the old while-loop which iterated once per full turn
+        return angle - 360.0 * math.floor((angle + 180.0) / 360.0)
 
     def update_current_angle(self, dt):
         """Update current angle based on gyroscope integration"""
-        gyro_z = self.read_gyro_data()
+        # Latest sample from the producer thread; never blocks on the bus
+        gyro_z = self._gyro_q[-1][0]
 
-        # Apply complementary filter
-        self.filtered_gyro = self.alpha * self.filtered_gyro + (1 - self.alpha) * gyro_z
+        # One-pole low-pass in incremental form (one multiply, no separate
+        # (1-alpha) term), re-discretised for the interval that actually elapsed
+        fg = self.filtered_gyro
+        fg += (dt / (dt + self.filter_tc)) * (gyro_z - fg)
+        self.filtered_gyro = fg
+
+        # With the motor idle and the rate near zero, whatever is left is bias;
+        # bleed it into the estimate slowly so integration drift stays bounded
+        if not self.is_moving and abs(gyro_z) < 0.5:
+            self.gyro_bias += 1e-4 * gyro_z
 
         # Integrate to get angle (simple integration)
-        self.current_angle += self.filtered_gyro * dt
+        self.current_angle += fg * dt
 
         # Normalize angle
         self.current_angle = self.normalize_angle(self.current_angle)
 
-        return self.filtered_gyro
+        return fg
 
     def rotate_360_degrees(self, angular_velocity=30):
         """
@@ -161,15 +339,28 @@ class AOCSPositioning:
         direction = 1 if angular_velocity > 0 else -1
         target_gyro = abs(angular_velocity)
 
-        dt = 0.02  # 50Hz control loop
+        dt = 0.02  # nominal 50Hz tick; the integrator uses the measured interval
+        period_ns = 20_000_000
         self.is_moving = True
 
+        # Hot-loop locals: LOAD_FAST instead of repeated attribute lookups
+        _update = self.update_current_angle
+        _set_dir = self.set_motor_direction
+        _set_spd = self.set_motor_speed
+
         try:
+            last_ns = time.monotonic_ns()
+            next_deadline = last_ns + period_ns
+            tick = 0
             while total_rotation < target_total_rotation and self.is_moving:
-                start_time = time.time()
+                now_ns = time.monotonic_ns()
+                actual_dt = (now_ns - last_ns) * 1e-9
+                last_ns = now_ns
+                if not 0.0 < actual_dt < 0.1:
+                    actual_dt = dt
 
-                # Update angle
-                current_gyro = self.update_current_angle(dt)
+                # Update angle with the interval that actually elapsed
+                current_gyro = _update(actual_dt)
 
                 # Calculate total rotation (always positive)
                 angle_change = abs(self.current_angle - start_angle)
@@ -180,21 +371,25 @@ class AOCSPositioning:
                 # Speed control using gyroscope feedback
                 gyro_error = target_gyro - abs(current_gyro)
 
-                # Simple proportional control for speed
-                speed_adjustment = gyro_error * 2.0
-                base_speed = 40  # Base PWM speed
-                motor_speed = max(25, min(80, base_speed + speed_adjustment))
+                # Simple proportional control for speed, clamped to [25, 80]
+                motor_speed = 40.0 + gyro_error * 2.0
+                motor_speed = 25.0 if motor_speed < 25.0 else (
+                    80.0 if motor_speed > 80.0 else motor_speed)
 
-                self.set_motor_direction(direction)
-                self.set_motor_speed(motor_speed)
+                _set_dir(direction)
+                _set_spd(motor_speed)
 
-                print(f"Rotation: {total_rotation:.1f}°/{target_total_rotation}°, "
-                      f"Gyro: {current_gyro:.1f} deg/s, Speed: {motor_speed:.0f}%")
+                # Console writes block; report every 16th tick (~3 Hz) instead of all 50
+                if (tick & 15) == 0:
+                    print(f"Rotation: {total_rotation:.1f}°/{target_total_rotation}°, "
+                          f"Gyro: {current_gyro:.1f} deg/s, Speed: {motor_speed:.0f}%")
+                tick += 1
 
-                # Maintain loop timing
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # Sleep to the absolute deadline so timing error does not accumulate
+                sleep_s = (next_deadline - time.monotonic_ns()) * 1e-9
+                if sleep_s > 0:
+                    time.sleep(sleep_s)
+                next_deadline += period_ns
 
         except KeyboardInterrupt:
             print("360° rotation interrupted")
@@ -212,25 +407,40 @@ class AOCSPositioning:
         self.target_angle = self.normalize_angle(target_angle)
         print(f"Moving to angle: {self.target_angle:.1f}°")
 
-        dt = 0.02  # 50Hz control loop
+        dt = 0.02  # nominal 50Hz tick; the PID uses the measured interval
+        period_ns = 20_000_000
         self.is_moving = True
-        self.error_sum = 0
-        self.last_error = 0
+        self.error_sum = 0.0
+        self.last_error = 0.0
+
+        # Hot-loop locals: LOAD_FAST instead of repeated attribute/global lookups
+        kp, ki, kd = self.Kp, self.Ki, self.Kd
+        step = pid_step
+        _update = self.update_current_angle
+        _set_dir = self.set_motor_direction
+        _set_spd = self.set_motor_speed
 
         tolerance = 2.0  # Position tolerance in degrees
         settled_count = 0
         required_settled_count = 10  # Must be settled for this many iterations
 
         try:
+            last_ns = time.monotonic_ns()
+            next_deadline = last_ns + period_ns
+            tick = 0
             while self.is_moving:
-                start_time = time.time()
+                now_ns = time.monotonic_ns()
+                actual_dt = (now_ns - last_ns) * 1e-9
+                last_ns = now_ns
+                if not 0.0 < actual_dt < 0.1:
+                    actual_dt = dt
 
-                # Update current angle
-                self.update_current_angle(dt)
+                # Update current angle with the interval that actually elapsed
+                _update(actual_dt)
 
-                # Calculate error
+                # Calculate error, normalised inline to handle wrap-around
                 error = self.target_angle - self.current_angle
-                error = self.normalize_angle(error)  # Handle wrap-around
+                error -= 360.0 * math.floor((error + 180.0) / 360.0)
 
                 # Check if we're within tolerance
                 if abs(error) < tolerance:
@@ -241,35 +451,35 @@ class AOCSPositioning:
                 else:
                     settled_count = 0
 
-                # PID control
-                self.error_sum += error * dt
-                self.error_sum = max(-50, min(50, self.error_sum))  # Anti-windup
-
-                error_rate = (error - self.last_error) / dt if dt > 0 else 0
+                # PID step in the shared (optionally jitted) kernel; +/-50 anti-windup
+                control_output, self.error_sum = step(
+                    error, self.error_sum, self.last_error,
+                    kp, ki, kd, actual_dt, 50.0)
                 self.last_error = error
 
-                control_output = (self.Kp * error +
-                                self.Ki * self.error_sum +
-                                self.Kd * error_rate)
-
                 # Convert to motor commands
                 if abs(control_output) < 5:
                     # Dead zone
                     self.stop_motor()
                 else:
                     direction = 1 if control_output > 0 else -1
-                    speed = min(abs(control_output), max_speed)
+                    speed = -control_output if control_output < 0 else control_output
+                    speed = max_speed if speed > max_speed else speed
 
-                    self.set_motor_direction(direction)
-                    self.set_motor_speed(speed)
+                    _set_dir(direction)
+                    _set_spd(speed)
 
-                print(f"Current: {self.current_angle:.1f}°, Target: {self.target_angle:.1f}°, "
-                      f"Error: {error:.1f}°, Control: {control_output:.1f}")
+                # Console writes block; report every 16th tick (~3 Hz) instead of all 50
+                if (tick & 15) == 0:
+                    print(f"Current: {self.current_angle:.1f}°, Target: {self.target_angle:.1f}°, "
+                          f"Error: {error:.1f}°, Control: {control_output:.1f}")
+                tick += 1
 
-                # Maintain loop timing
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # Sleep to the absolute deadline so timing error does not accumulate
+                sleep_s = (next_deadline - time.monotonic_ns()) * 1e-9
+                if sleep_s > 0:
+                    time.sleep(sleep_s)
+                next_deadline += period_ns
 
         except KeyboardInterrupt:
             print("Movement interrupted")
@@ -277,6 +487,20 @@ class AOCSPositioning:
             self.stop_motor()
             self.is_moving = False
 
+    def _command_worker(self):
+        """Consume queued movement commands one at a time
+
+        The blocking control loops run here instead of the main thread, so
+        the CLI keeps accepting input while a move is in progress. A None
+        command shuts the worker down
+        """
+        while True:
+            command = self.command_queue.get()
+            if command is None:
+                break
+            result = self.process_command(command)
+            print(f"Result: {result}")
+
     def process_command(self, command):
         """
         Process movement command
@@ -303,13 +527,9 @@ class AOCSPositioning:
             return {"status": "error", "message": str(e)}
 
     def get_current_position(self):
-        """Get current position information"""
-        return {
-            "current_angle": self.current_angle,
-            "target_angle": self.target_angle,
-            "is_moving": self.is_moving,
-            "gyro_reading": self.filtered_gyro
-        }
+        """Get current position information as a Position snapshot"""
+        return Position(self.current_angle, self.target_angle,
+                        self.is_moving, self.filtered_gyro)
 
     def emergency_stop(self):
         """Emergency stop function"""
@@ -320,9 +540,18 @@ class AOCSPositioning:
     def cleanup(self):
         """Clean up resources"""
         self.emergency_stop()
-        if hasattr(self, 'pwm'):
-            self.pwm.stop()
-        GPIO.cleanup()
+        self.command_queue.put(None)
+        self._command_thread.join(timeout=0.5)
+        self._imu_running = False
+        if self._imu_thread is not None:
+            self._imu_thread.join(timeout=0.5)
+        if self._pi is not None:
+            self._pi.hardware_PWM(ENA, 0, 0)
+            self._pi.stop()
+        else:
+            if self.pwm is not None:
+                self.pwm.stop()
+            GPIO.cleanup()
         print("Cleanup completed")
 
 def main():
@@ -346,26 +575,23 @@ def main():
                     break
                 elif user_input == 'status':
                     pos = aocs.get_current_position()
-                    print(f"Current angle: {pos['current_angle']:.1f}°")
-                    print(f"Target angle: {pos['target_angle']:.1f}°")
-                    print(f"Moving: {pos['is_moving']}")
-                    print(f"Gyro: {pos['gyro_reading']:.1f} deg/s")
+                    print(f"Current angle: {pos.current_angle:.1f}°")
+                    print(f"Target angle: {pos.target_angle:.1f}°")
+                    print(f"Moving: {pos.is_moving}")
+                    print(f"Gyro: {pos.gyro_reading:.1f} deg/s")
                 elif user_input == 'stop':
                     aocs.emergency_stop()
                 elif user_input.startswith('360'):
                     parts = user_input.split()
                     speed = float(parts[1]) if len(parts) > 1 else 30
-                    command = {"type": "rotate_360", "speed": speed}
-                    result = aocs.process_command(command)
-                    print(f"Result: {result}")
+                    aocs.command_queue.put({"type": "rotate_360", "speed": speed})
                 elif user_input.startswith('move'):
                     parts = user_input.split()
                     if len(parts) >= 2:
                         angle = float(parts[1])
                         speed = float(parts[2]) if len(parts) > 2 else 50
-                        command = {"type": "move_to_angle", "angle": angle, "speed": speed}
-                        result = aocs.process_command(command)
-                        print(f"Result: {result}")
+                        aocs.command_queue.put({"type": "move_to_angle",
+                                               "angle": angle, "speed": speed})
                     else:
                         print("Usage: move [angle] [optional_speed]")
                 else:
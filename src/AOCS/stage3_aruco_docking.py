@@ -1,3 +1,6 @@
+import logging
+import logging.handlers
+import math
 import time
 import smbus
 import RPi.GPIO as GPIO
@@ -5,9 +8,20 @@ import numpy as np
 import json
 import threading
 from queue import Queue
+from typing import NamedTuple
 import socket
 import struct
 
+try:
+    import pigpio
+except ImportError:  # pigpio is optional - fall back to software-timed RPi.GPIO
+    pigpio = None
+
+try:
+    from AOCS._pid_kernels import pid_step
+except ImportError:  # running as a script from inside src/AOCS
+    from _pid_kernels import pid_step
+
 # Pin Configuration (same as previous scripts)
 IN1 = 17     # GPIO17 (Pin 11) - Motor direction pin 1
 IN2 = 27     # GPIO27 (Pin 13) - Motor direction pin 2
@@ -24,6 +38,33 @@ GYRO_ZOUT_H = 0x47
 GYRO_ZOUT_L = 0x48
 PWR_MGMT_1 = 0x6B
 GYRO_CONFIG = 0x1B
+CONFIG = 0x1A
+FIFO_EN = 0x23
+USER_CTRL = 0x6A
+FIFO_COUNT_H = 0x72
+FIFO_COUNT_L = 0x73
+FIFO_R_W = 0x74
+
+GYRO_SCALE = 1.0 / 131.0  # +/-250 dps range: LSB -> deg/s
+
+# Compiled once; decodes the big-endian int16 Z-axis sample in one C call
+_GYRO_Z = struct.Struct('>h')
+
+# Vision wire format: angle_error (f32), distance (f32), detected (u8),
+# little-endian; compiled once so each message skips format-string parsing
+_VISION_MSG = struct.Struct('<ffB')
+
+class Vision(NamedTuple):
+    """Immutable snapshot of the latest vision sample
+
+    Published by the comms thread in a single atomic attribute bind; readers
+    get C-level attribute access instead of string-keyed dict lookups
+    """
+    angle_error: float
+    distance: float
+    detected: bool
+    ts: float
+
 
 class AOCSArUcoDocking:
     def __init__(self, communication_port=8888):
@@ -44,17 +85,35 @@ class AOCSArUcoDocking:
         self.Ki = 0.02
         self.Kd = 0.1
 
-        # PID variables
-        self.error_sum = 0
-        self.last_error = 0
+        # PID variables (floats keep the jitted kernel signature stable)
+        self.error_sum = 0.0
+        self.last_error = 0.0
 
         # Filter parameters
         self.alpha = 0.85
         self.filtered_gyro = 0.0
 
-        # Communication variables
-        self.vision_data = {"angle_error": 0.0, "distance": 0.0, "detected": False}
-        self.last_vision_update = 0
+        # Last motor state written to the pins; reprogramming the PWM every
+        # tick glitches the output, so the setters skip unchanged commands
+        self._dir_pins = [IN1, IN2]
+        self._last_dir = None
+        self._last_duty = -1.0
+
+        # Latest vision sample, swapped in one attribute bind (atomic under
+        # the GIL) so readers always see a consistent snapshot
+        self._vision = Vision(0.0, 0.0, False, 0.0)
+
+        # Off-thread logging for the control loops: records go onto a queue
+        # and a background listener does the file I/O, so the 20 ms ticks
+        # never block on a write syscall
+        self._log = logging.getLogger("aocs.stage3")
+        if not self._log.handlers:
+            log_queue = Queue()
+            self._log.addHandler(logging.handlers.QueueHandler(log_queue))
+            self._log.setLevel(logging.DEBUG)
+            self._log_listener = logging.handlers.QueueListener(
+                log_queue, logging.FileHandler("aocs_stage3.log"))
+            self._log_listener.start()
 
         # Initialize hardware
         self.setup_gpio()
@@ -67,14 +126,30 @@ class AOCSArUcoDocking:
         self.comm_thread.start()
 
     def setup_gpio(self):
-        """Setup GPIO pins for motor control"""
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(ENA, GPIO.OUT)
-        GPIO.setup(IN1, GPIO.OUT)
-        GPIO.setup(IN2, GPIO.OUT)
+        """Setup GPIO pins for motor control
 
-        self.pwm = GPIO.PWM(ENA, 1000)
-        self.pwm.start(0)
+        pigpio is preferred when its daemon is running: BCM18 has a hardware
+        PWM channel, so ENA gets DMA-driven, glitch-free PWM and the software
+        PWM thread disappears. RPi.GPIO remains the fallback backend
+        """
+        self._pi = None
+        self.pwm = None
+        if pigpio is not None:
+            pi = pigpio.pi()
+            if pi.connected:
+                self._pi = pi
+                pi.set_mode(IN1, pigpio.OUTPUT)
+                pi.set_mode(IN2, pigpio.OUTPUT)
+                pi.hardware_PWM(ENA, 1000, 0)
+
+        if self._pi is None:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(ENA, GPIO.OUT)
+            GPIO.setup(IN1, GPIO.OUT)
+            GPIO.setup(IN2, GPIO.OUT)
+
+            self.pwm = GPIO.PWM(ENA, 1000)
+            self.pwm.start(0)
 
         # Ensure motor is stopped
         self.stop_motor()
@@ -87,6 +162,9 @@ class AOCSArUcoDocking:
         """Initialize the MPU9250 IMU"""
         self.bus.write_byte_data(MPU9250_ADDR, PWR_MGMT_1, 0x00)
         self.bus.write_byte_data(MPU9250_ADDR, GYRO_CONFIG, 0x00)
+        # 41 Hz on-chip DLPF: the sensor pre-filters, so software sees
+        # smoother samples without extra per-tick work
+        self.bus.write_byte_data(MPU9250_ADDR, CONFIG, 0x03)
         time.sleep(0.1)
 
     def load_initialization_data(self):
@@ -103,34 +181,76 @@ class AOCSArUcoDocking:
     def read_gyro_data(self):
         """Read gyroscope data"""
         try:
-            data = self.bus.read_i2c_block_data(MPU9250_ADDR, GYRO_XOUT_H, 6)
-
-            gyro_z = (data[4] << 8) | data[5]
-            if gyro_z > 32767:
-                gyro_z -= 65536
-
-            gyro_z = gyro_z / 131.0 - self.gyro_bias
-            return gyro_z
+            # Only the Z axis is used, so read just its two registers
+            data = self.bus.read_i2c_block_data(MPU9250_ADDR, GYRO_ZOUT_H, 2)
+            gyro_z = _GYRO_Z.unpack(bytes(data))[0]
+            return gyro_z * GYRO_SCALE - self.gyro_bias
         except Exception as e:
             print(f"Error reading gyroscope: {e}")
             return 0.0
 
+    def _enable_gyro_fifo(self):
+        """Route gyro Z into the on-chip FIFO at the sensor's 1 kHz rate"""
+        self.bus.write_byte_data(MPU9250_ADDR, USER_CTRL, 0x44)  # enable + reset
+        self.bus.write_byte_data(MPU9250_ADDR, FIFO_EN, 0x10)    # gyro Z only
+
+    def _disable_gyro_fifo(self):
+        """Stop FIFO collection and return to direct register reads"""
+        self.bus.write_byte_data(MPU9250_ADDR, FIFO_EN, 0x00)
+        self.bus.write_byte_data(MPU9250_ADDR, USER_CTRL, 0x00)
+
+    def _drain_gyro_fifo(self):
+        """Read every queued Z sample and return them in deg/s (may be empty)
+
+        The FIFO collects at 1 kHz between control ticks, so each 20 ms tick
+        drains ~20 samples in a couple of block reads - the same transaction
+        count as one direct read but 20x the information, and averaging the
+        batch cuts the rate noise by roughly sqrt(n)
+        """
+        count = ((self.bus.read_byte_data(MPU9250_ADDR, FIFO_COUNT_H) << 8) |
+                 self.bus.read_byte_data(MPU9250_ADDR, FIFO_COUNT_L)) & ~1
+        chunks = []
+        while count > 0:
+            n = 32 if count > 32 else count  # smbus block reads cap at 32 bytes
+            chunks.append(bytes(self.bus.read_i2c_block_data(
+                MPU9250_ADDR, FIFO_R_W, n)))
+            count -= n
+        if not chunks:
+            return np.empty(0, np.float32)
+        raw = np.frombuffer(b''.join(chunks), dtype='>i2')
+        return raw.astype(np.float32) * GYRO_SCALE - self.gyro_bias
+
     def set_motor_direction(self, direction):
         """Set motor direction: 1=forward, -1=reverse, 0=stop"""
-        if direction > 0:
-            GPIO.output(IN1, GPIO.HIGH)
-            GPIO.output(IN2, GPIO.LOW)
+        direction = (direction > 0) - (direction < 0)
+        if direction == self._last_dir:
+            return
+        self._last_dir = direction
+        if self._pi is not None:
+            self._pi.write(IN1, 1 if direction > 0 else 0)
+            self._pi.write(IN2, 1 if direction < 0 else 0)
+        elif direction > 0:
+            GPIO.output(self._dir_pins, (GPIO.HIGH, GPIO.LOW))
         elif direction < 0:
-            GPIO.output(IN1, GPIO.LOW)
-            GPIO.output(IN2, GPIO.HIGH)
+            GPIO.output(self._dir_pins, (GPIO.LOW, GPIO.HIGH))
         else:
-            GPIO.output(IN1, GPIO.LOW)
-            GPIO.output(IN2, GPIO.LOW)
+            GPIO.output(self._dir_pins, (GPIO.LOW, GPIO.LOW))
 
     def set_motor_speed(self, speed):
         """Set motor speed (0-100%)"""
-        speed = max(0, min(100, abs(speed)))
-        self.pwm.ChangeDutyCycle(speed)
+        # Inline clamp: conditional expressions instead of abs/min/max calls
+        speed = -speed if speed < 0 else speed
+        speed = 100.0 if speed > 100.0 else speed
+        # Skip writes within half a percent of the current duty - redundant
+        # reprogramming glitches the PWM and costs a syscall per tick
+        if abs(speed - self._last_duty) < 0.5:
+            return
+        self._last_duty = speed
+        if self._pi is not None:
+            # pigpio expresses duty in units of 1e-6
+            self._pi.hardware_PWM(ENA, 1000, int(speed * 10_000))
+        else:
+            self.pwm.ChangeDutyCycle(speed)
 
     def stop_motor(self):
         """Stop the motor"""
@@ -139,11 +259,9 @@ class AOCSArUcoDocking:
 
     def normalize_angle(self, angle):
         """Normalize angle to [-180, 180] range"""
-        while angle > 180:
-            angle -= 360
-        while angle < -180:
-            angle += 360
-        return angle
+        # Branchless: constant cost regardless of how far the angle has wound up,
+        # unlike the old while-loop which iterated once per full turn
+        return angle - 360.0 * math.floor((angle + 180.0) / 360.0)
 
     def update_current_angle(self, dt):
         """Update current angle based on gyroscope integration"""
@@ -152,51 +270,46 @@ class AOCSArUcoDocking:
         # Apply complementary filter
         self.filtered_gyro = self.alpha * self.filtered_gyro + (1 - self.alpha) * gyro_z
 
-        # Integrate to get angle (simple integration)
+        # Integrate to get angle; deliberately left unnormalised - the wrap
+        # only matters when computing an error, where math.remainder handles
+        # it in one libm call, and an accumulating angle makes total-rotation
+        # tracking a plain subtraction
         self.current_angle += self.filtered_gyro * dt
 
-        # Normalize angle
-        self.current_angle = self.normalize_angle(self.current_angle)
-
         return self.filtered_gyro
 
     def communication_handler(self):
-        """Handle communication with vision system"""
+        """Handle communication with vision system
+
+        Datagram transport: vision samples are latest-wins telemetry, so
+        UDP's drop-rather-than-retransmit semantics fit better than a TCP
+        stream - no connection state, no per-message ack round-trip, and a
+        backlog never delays fresh data. Each datagram is one message, so
+        framing is free
+        """
         try:
-            # Create socket server to receive vision data
-            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Create datagram socket to receive vision data
+            server_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             server_socket.bind(('localhost', self.communication_port))
-            server_socket.listen(1)
 
-            print(f"Listening for vision system on port {self.communication_port}")
+            print(f"Listening for vision datagrams on port {self.communication_port}")
+
+            msg_size = _VISION_MSG.size
+            buf = bytearray(msg_size)
 
             while True:
                 try:
-                    client_socket, addr = server_socket.accept()
-                    print(f"Vision system connected from {addr}")
-
-                    while True:
-                        # Receive data: angle_error (float), distance (float), detected (bool)
-                        data = client_socket.recv(13)  # 4 + 4 + 1 bytes
-                        if not data:
-                            break
-
-                        # Unpack data
-                        angle_error, distance, detected_byte = struct.unpack('ffB', data)
-                        detected = bool(detected_byte)
-
-                        # Update vision data
-                        self.vision_data = {
-                            "angle_error": angle_error,
-                            "distance": distance,
-                            "detected": detected
-                        }
-                        self.last_vision_update = time.time()
-
-                        # Send acknowledgment
-                        ack = struct.pack('B', 1)
-                        client_socket.send(ack)
+                    n = server_socket.recv_into(buf, msg_size)
+                    if n != msg_size:
+                        continue  # runt datagram - ignore
+
+                    angle_error, distance, detected_byte = _VISION_MSG.unpack_from(buf)
+
+                    # One atomic attribute bind publishes the whole sample;
+                    # monotonic timestamp so staleness checks survive clock steps
+                    self._vision = Vision(angle_error, distance,
+                                          bool(detected_byte), time.monotonic())
 
                 except Exception as e:
                     print(f"Communication error: {e}")
@@ -221,35 +334,46 @@ class AOCSArUcoDocking:
         target_gyro = abs(angular_velocity)
 
         dt = 0.02  # 50Hz control loop
+        period_ns = 20_000_000
         self.is_moving = True
 
         # Store detected ArUco positions during rotation
         aruco_detections = []
 
-        try:
-            while total_rotation < target_total_rotation and self.is_moving:
-                start_time = time.time()
+        log = self._log.debug
 
-                # Update angle
-                current_gyro = self.update_current_angle(dt)
+        # Batch samples through the on-chip FIFO for the duration of the turn
+        self._enable_gyro_fifo()
 
-                # Check for ArUco detection
-                if self.vision_data["detected"]:
+        try:
+            next_tick = time.monotonic_ns() + period_ns
+            tick = 0
+            while total_rotation < target_total_rotation and self.is_moving:
+                # Drain the FIFO and integrate every 1 kHz sample collected
+                # since the last tick (1 ms spacing each)
+                samples = self._drain_gyro_fifo()
+                if samples.size:
+                    self.current_angle += float(samples.sum()) * 0.001
+                    self.filtered_gyro += ((1 - self.alpha) *
+                                           (float(samples.mean()) - self.filtered_gyro))
+                current_gyro = self.filtered_gyro
+
+                # Check for ArUco detection (one consistent snapshot)
+                v = self._vision
+                if v.detected:
                     detection_info = {
                         "angle": self.current_angle,
-                        "angle_error": self.vision_data["angle_error"],
-                        "distance": self.vision_data["distance"],
+                        "angle_error": v.angle_error,
+                        "distance": v.distance,
                         "timestamp": time.time()
                     }
                     aruco_detections.append(detection_info)
-                    print(f"ArUco detected at angle {self.current_angle:.1f}°, "
-                          f"error: {self.vision_data['angle_error']:.1f}°")
+                    log("ArUco detected at angle %.1f deg, error: %.1f deg",
+                        self.current_angle, v.angle_error)
 
-                # Calculate total rotation
-                angle_change = abs(self.current_angle - start_angle)
-                if angle_change > 180:
-                    angle_change = 360 - angle_change
-                total_rotation = angle_change
+                # The integrated angle is unnormalised, so total rotation is a
+                # plain difference - no wrap bookkeeping
+                total_rotation = abs(self.current_angle - start_angle)
 
                 # Speed control using gyroscope feedback
                 gyro_error = target_gyro - abs(current_gyro)
@@ -262,17 +386,23 @@ class AOCSArUcoDocking:
                 self.set_motor_direction(direction)
                 self.set_motor_speed(motor_speed)
 
-                print(f"Rotation: {total_rotation:.1f}°/{target_total_rotation}°, "
-                      f"Gyro: {current_gyro:.1f} deg/s, ArUco: {self.vision_data['detected']}")
+                # Decimated to every 25th tick (2 Hz); %-args defer formatting
+                tick += 1
+                if tick % 25 == 0:
+                    log("Rotation: %.1f/%.1f deg, Gyro: %.1f deg/s, ArUco: %s",
+                        total_rotation, target_total_rotation, current_gyro,
+                        v.detected)
 
-                # Maintain loop timing
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # Sleep to the absolute deadline so timing error does not accumulate
+                next_tick += period_ns
+                sleep_s = (next_tick - time.monotonic_ns()) * 1e-9
+                if sleep_s > 0:
+                    time.sleep(sleep_s)
 
         except KeyboardInterrupt:
             print("360° rotation interrupted")
         finally:
+            self._disable_gyro_fifo()
             self.stop_motor()
             self.is_moving = False
             print(f"360° rotation completed. ArUco detections: {len(aruco_detections)}")
@@ -290,36 +420,48 @@ class AOCSArUcoDocking:
         print(f"Moving to angle: {self.target_angle:.1f}° with vision assistance")
 
         dt = 0.02  # 50Hz control loop
+        period_ns = 20_000_000
         self.is_moving = True
-        self.error_sum = 0
-        self.last_error = 0
+        self.error_sum = 0.0
+        self.last_error = 0.0
+
+        # Hot-loop locals: LOAD_FAST instead of repeated attribute lookups
+        kp, ki, kd = self.Kp, self.Ki, self.Kd
+        step = pid_step
+        _update = self.update_current_angle
+        _set_dir = self.set_motor_direction
+        _set_spd = self.set_motor_speed
+        _stop = self.stop_motor
+        now = time.monotonic
 
         tolerance = self.docking_tolerance
         settled_count = 0
         required_settled_count = 25  # Must be settled longer for precision
 
+        log = self._log.debug
+
         try:
+            next_tick = time.monotonic_ns() + period_ns
+            tick = 0
             while self.is_moving:
-                start_time = time.time()
-
                 # Update current angle
-                self.update_current_angle(dt)
+                _update(dt)
 
-                # Calculate error from gyroscope
-                gyro_error = self.target_angle - self.current_angle
-                gyro_error = self.normalize_angle(gyro_error)
+                # Wrap-safe error in (-180, 180] via a single libm call
+                gyro_error = math.remainder(self.target_angle - self.current_angle,
+                                            360.0)
 
                 # Use vision correction if available and recent
                 final_error = gyro_error
-                if (self.vision_data["detected"] and
-                    time.time() - self.last_vision_update < 0.5):
+                v = self._vision
+                if v.detected and now() - v.ts < 0.5:
                     # Combine gyro and vision errors
-                    vision_error = self.vision_data["angle_error"]
+                    vision_error = v.angle_error
                     # Weight more heavily on vision when close
                     vision_weight = min(1.0, abs(gyro_error) / 10.0)
                     final_error = vision_weight * vision_error + (1 - vision_weight) * gyro_error
-                    print(f"Vision-assisted: Gyro error: {gyro_error:.1f}°, "
-                          f"Vision error: {vision_error:.1f}°, Final: {final_error:.1f}°")
+                    log("Vision-assisted: gyro error %.1f, vision error %.1f, "
+                        "final %.1f deg", gyro_error, vision_error, final_error)
 
                 # Check if we're within tolerance
                 if abs(final_error) < tolerance:
@@ -330,21 +472,16 @@ class AOCSArUcoDocking:
                 else:
                     settled_count = 0
 
-                # PID control with more conservative parameters
-                self.error_sum += final_error * dt
-                self.error_sum = max(-30, min(30, self.error_sum))  # Anti-windup
-
-                error_rate = (final_error - self.last_error) / dt if dt > 0 else 0
+                # PID step in the shared kernel; +/-30 anti-windup for docking
+                control_output, self.error_sum = step(
+                    final_error, self.error_sum, self.last_error,
+                    kp, ki, kd, dt, 30.0)
                 self.last_error = final_error
 
-                control_output = (self.Kp * final_error +
-                                self.Ki * self.error_sum +
-                                self.Kd * error_rate)
-
                 # Convert to motor commands
                 if abs(control_output) < 3:
                     # Smaller dead zone for precision
-                    self.stop_motor()
+                    _stop()
                 else:
                     direction = 1 if control_output > 0 else -1
                     speed = min(abs(control_output), max_speed)
@@ -353,16 +490,20 @@ class AOCSArUcoDocking:
                     if abs(final_error) < 5:
                         speed = max(speed * 0.5, 15)  # Minimum speed for movement
 
-                    self.set_motor_direction(direction)
-                    self.set_motor_speed(speed)
+                    _set_dir(direction)
+                    _set_spd(speed)
 
-                print(f"Current: {self.current_angle:.1f}°, Target: {self.target_angle:.1f}°, "
-                      f"Error: {final_error:.1f}°, Speed: {speed:.0f}%")
+                # Decimated to every 25th tick (2 Hz); %-args defer formatting
+                tick += 1
+                if tick % 25 == 0:
+                    log("Current: %.1f deg, Target: %.1f deg, Error: %.1f deg",
+                        self.current_angle, self.target_angle, final_error)
 
-                # Maintain loop timing
-                elapsed = time.time() - start_time
-                sleep_time = max(0, dt - elapsed)
-                time.sleep(sleep_time)
+                # Sleep to the absolute deadline so timing error does not accumulate
+                next_tick += period_ns
+                sleep_s = (next_tick - time.monotonic_ns()) * 1e-9
+                if sleep_s > 0:
+                    time.sleep(sleep_s)
 
         except KeyboardInterrupt:
             print("Movement interrupted")
@@ -381,22 +522,25 @@ class AOCSArUcoDocking:
 
         try:
             while self.is_docking and correction_count < max_corrections:
-                start_time = time.time()
+                start_time = time.monotonic()
+
+                # One consistent snapshot of the latest vision sample
+                v = self._vision
 
                 # Wait for fresh vision data
-                if not self.vision_data["detected"]:
+                if not v.detected:
                     print("Waiting for ArUco detection...")
                     time.sleep(0.1)
                     continue
 
                 # Check if vision data is recent
-                if time.time() - self.last_vision_update > 2.0:
+                if time.monotonic() - v.ts > 2.0:
                     print("Vision data too old, waiting for update...")
                     time.sleep(0.1)
                     continue
 
-                angle_error = self.vision_data["angle_error"]
-                distance = self.vision_data["distance"]
+                angle_error = v.angle_error
+                distance = v.distance
 
                 print(f"Docking correction {correction_count + 1}: "
                       f"Angle error: {angle_error:.2f}°, Distance: {distance:.2f}")
@@ -429,7 +573,7 @@ class AOCSArUcoDocking:
                     time.sleep(0.2)
 
                 # Maintain correction interval
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 sleep_time = max(0, self.correction_interval - elapsed)
                 time.sleep(sleep_time)
 
@@ -461,7 +605,8 @@ class AOCSArUcoDocking:
                 angle = command["angle"]
                 speed = command.get("speed", 40)
                 self.move_to_angle_vision_assisted(angle, speed)
-                return {"status": "completed", "final_angle": self.current_angle}
+                return {"status": "completed",
+                        "final_angle": self.normalize_angle(self.current_angle)}
 
             elif command["type"] == "dock":
                 max_corrections = command.get("max_corrections", 50)
@@ -478,14 +623,19 @@ class AOCSArUcoDocking:
 
     def get_current_status(self):
         """Get comprehensive status information"""
+        v = self._vision
         return {
-            "current_angle": self.current_angle,
+            "current_angle": self.normalize_angle(self.current_angle),
             "target_angle": self.target_angle,
             "is_moving": self.is_moving,
             "is_docking": self.is_docking,
             "gyro_reading": self.filtered_gyro,
-            "vision_data": self.vision_data,
-            "vision_age": time.time() - self.last_vision_update if self.last_vision_update > 0 else float('inf')
+            "vision_data": {
+                "angle_error": v.angle_error,
+                "distance": v.distance,
+                "detected": v.detected
+            },
+            "vision_age": time.monotonic() - v.ts if v.ts > 0 else float('inf')
         }
 
     def emergency_stop(self):
@@ -498,9 +648,15 @@ class AOCSArUcoDocking:
     def cleanup(self):
         """Clean up resources"""
         self.emergency_stop()
-        if hasattr(self, 'pwm'):
-            self.pwm.stop()
-        GPIO.cleanup()
+        if hasattr(self, '_log_listener'):
+            self._log_listener.stop()
+        if self._pi is not None:
+            self._pi.hardware_PWM(ENA, 0, 0)
+            self._pi.stop()
+        else:
+            if self.pwm is not None:
+                self.pwm.stop()
+            GPIO.cleanup()
         print("Cleanup completed")
 
 def main():
@@ -515,7 +671,7 @@ def main():
         print("4. 'status' - Show current status including vision data")
         print("5. 'stop' - Emergency stop")
         print("6. 'quit' - Exit program")
-        print("\nNote: Make sure vision system is connected on port 8888")
+        print("\nNote: Make sure vision system sends UDP datagrams to port 8888")
         print()
 
         while True:
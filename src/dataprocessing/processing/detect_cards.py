@@ -29,7 +29,7 @@ def image_valid(img: np.ndarray) -> int:
 
 def detect_card_contours(
     img: np.ndarray, width_range: Tuple[int, int], height_range: Tuple[int, int], args: Tuple[int], algo: str = "canny",
-    find_cnts: Tuple[str, str] = (cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    find_cnts: Tuple[str, str] = (cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE), edges: np.ndarray = None
 ) -> List[Tuple[float, float, float, float]]:
     """
     Detects card (rectangular) contours in an image
@@ -42,6 +42,10 @@ def detect_card_contours(
         - args: The arguments for the algorithm
             - canny: The threshold values for the canny algorithm - (max, min)
         - find_cnts: The arguments for finding contours (default: (cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE))
+        - edges (None): optional preallocated output buffer for the edge map - callers running per frame
+          can pass the same array every call so the Canny result is written in place instead of
+          allocated fresh, and can reuse the edge map afterwards (e.g. for display) without a second
+          Canny pass
 
     Returns:
         - img: Coordinates of results (x, y, width, height)
@@ -75,7 +79,7 @@ def detect_card_contours(
             raise ValueError("Error A.3: Invalid Arguments for Finding Contours")
         min_thresh, max_thresh = args
         mode, method = find_cnts
-        edges = cv2.Canny(img, min_thresh, max_thresh)
+        edges = cv2.Canny(img, min_thresh, max_thresh, edges=edges)
         cnts, _ = cv2.findContours(edges, mode, method)
     else:
         raise ValueError("Error A.1: Invalid Algorithm or not Implemented")
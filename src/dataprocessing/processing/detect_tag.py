@@ -31,7 +31,8 @@ def image_valid(img: np.ndarray) -> int:
 
 def detect_aruco(
     img: np.ndarray, aruco_dict: cv2.aruco.Dictionary, aruco_parameters: cv2.aruco.DetectorParameters,
-    calibration: Dict[str, List[float]], marker_side_cm: float, debug: bool = False
+    calibration: Dict[str, List[float]], marker_side_cm: float, debug: bool = False,
+    detector: cv2.aruco.ArucoDetector = None
 ) -> Dict[str, List[float]]:
 
     """
@@ -46,6 +47,8 @@ def detect_aruco(
             - "distortion_mat": [k1, k2, p1, p2, k3]
         - marker_side_cm: The side length of the marker in cm
         - debug (false): allows viewing of the detected tag, but debug purposes
+        - detector (None): a prebuilt cv2.aruco.ArucoDetector - pass one when calling per frame
+          so the detector (and its dictionary table) is not rebuilt on every call
 
     Returns:
         - {}: ArUco tag not detected
@@ -71,7 +74,8 @@ def detect_aruco(
     elif img_validity == -2:
         raise ValueError("Error I.2: Image Array format is invalid")
 
-    detector = cv2.aruco.ArucoDetector(aruco_dict, aruco_parameters)
+    if detector is None:
+        detector = cv2.aruco.ArucoDetector(aruco_dict, aruco_parameters)
 
     # corners - (x, y) for the tags; ids - ID encoded in tag; rejected - potential markers but rejected
     if debug: